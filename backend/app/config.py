@@ -48,6 +48,12 @@ class Settings(BaseSettings):
     max_audio_duration: int = Field(default=300, env="MAX_AUDIO_DURATION")  # seconds
     audio_sample_rate: int = Field(default=16000, env="AUDIO_SAMPLE_RATE")
     audio_chunk_size: int = Field(default=1024, env="AUDIO_CHUNK_SIZE")
+    cpu_workers: int = Field(default=2, env="CPU_WORKERS")  # Audio decode processes (0 = decode in a thread)
+    # Uvicorn processes; each loads its own models. Ignored while RELOAD is on, and forced to 1 when
+    # GPU acceleration is enabled: the GPU concurrency cap and /api/v1/last-reasoning are per process
+    web_workers: int = Field(default=1, env="WEB_CONCURRENCY")
+    audio_buffer_pool_size: int = Field(default=4, env="AUDIO_BUFFER_POOL_SIZE")  # Preallocated STT decode buffers
+    opus_min_bytes: int = Field(default=256 * 1024, env="OPUS_MIN_BYTES")  # WAV replies this large go out as Opus when accepted
     
     # Security Configuration
     cors_origins: List[str] = Field(
@@ -69,9 +75,14 @@ class Settings(BaseSettings):
     enable_voice_activity_detection: bool = Field(default=True, env="ENABLE_VOICE_ACTIVITY_DETECTION")
     enable_noise_reduction: bool = Field(default=True, env="ENABLE_NOISE_REDUCTION")
     
+    # Startup
+    warmup_on_start: bool = Field(default=True, env="WARMUP_ON_START")  # Dummy STT/LLM requests before serving
+    vibevoice_cuda_graphs: bool = Field(default=True, env="VIBEVOICE_CUDA_GRAPHS")  # Capture diffusion head during warmup
+    
     # Rate Limiting
     rate_limit_requests_per_minute: int = Field(default=60, env="RATE_LIMIT_REQUESTS_PER_MINUTE")
     rate_limit_concurrent_sessions: int = Field(default=10, env="RATE_LIMIT_CONCURRENT_SESSIONS")
+    max_gpu_concurrency: int = Field(default=4, env="MAX_GPU_CONCURRENCY")  # Concurrent STT/LLM/TTS pipelines
     
     # RTX 5090 GPU Acceleration Configuration
     gpu_acceleration_enabled: bool = Field(default=True, env="GPU_ACCELERATION_ENABLED")
@@ -97,13 +108,14 @@ class Settings(BaseSettings):
     # Performance Monitoring
     enable_gpu_monitoring: bool = Field(default=True, env="ENABLE_GPU_MONITORING")
     performance_logging: bool = Field(default=True, env="PERFORMANCE_LOGGING")
+    health_cache_ttl: float = Field(default=2.0, env="HEALTH_CACHE_TTL")  # seconds between real /health probes
     benchmark_mode: bool = Field(default=False, env="BENCHMARK_MODE")
     
     @field_validator('gpu_acceleration_enabled', 'gpu_allow_growth', 'onnx_enable_profiling', 
                      'enable_gpu_monitoring', 'performance_logging', 'benchmark_mode',
                      'debug', 'reload', 'enable_voice_cloning', 'enable_performance_logging',
                      'enable_real_time_stt', 'enable_streaming_tts', 'enable_voice_activity_detection',
-                     'enable_noise_reduction', mode='before')
+                     'enable_noise_reduction', 'warmup_on_start', 'vibevoice_cuda_graphs', mode='before')
     @classmethod
     def validate_booleans(cls, v):
         """Strip whitespace from boolean environment variables"""
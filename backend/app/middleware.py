@@ -0,0 +1,48 @@
+"""
+HTTP middleware for the Voice Bridge API
+"""
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Content types that are already compressed (or gain nothing from gzip);
+# multipart/mixed carries the voice-chat audio behind a small JSON part, and
+# NDJSON event streams must reach the client line by line rather than in gzip blocks
+GZIP_SKIP_PREFIXES = (
+    "audio/", "image/", "video/", "application/octet-stream", "multipart/mixed", "application/x-ndjson"
+)
+
+
+class AudioAwareGZipMiddleware:
+    """GZip middleware that passes audio and binary responses through untouched
+
+    The response start decides the route: skipped content types go straight to the
+    client, everything else goes through Starlette's GZipResponder. Both routes send
+    inline, so a failed client send raises in the app and streaming keeps backpressure.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 9) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get("Accept-Encoding", ""):
+            await self.app(scope, receive, send)
+            return
+
+        responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+        responder.send = send
+        # Starlette 0.27 (pinned via FastAPI) names it send_with_gzip; later releases send_with_compression
+        send_compressed: Send = getattr(responder, "send_with_gzip", None) or responder.send_with_compression
+        route: Send = send
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal route
+            if message["type"] == "http.response.start":
+                content_type = Headers(raw=message["headers"]).get("content-type", "")
+                route = send if content_type.startswith(GZIP_SKIP_PREFIXES) else send_compressed
+            await route(message)
+
+        await self.app(scope, receive, send_wrapper)
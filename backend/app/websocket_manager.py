@@ -2,31 +2,96 @@
 WebSocket connection manager for real-time voice communication
 """
 
-from typing import List
-from fastapi import WebSocket
+import asyncio
+from typing import Any, Dict, Set, Union
+from fastapi import WebSocket, WebSocketDisconnect
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Binary audio frame size for WebSocket delivery
+AUDIO_FRAME_SIZE = 32 * 1024
+
+# Heartbeat reply, serialized once
+PONG_MESSAGE = orjson.dumps({"type": "pong"}).decode()
+
+
+def parse_json_object(payload: Union[str, bytes]) -> Dict[str, Any]:
+    """Parse a JSON control frame; empty frames are {}, anything but an object raises ValueError"""
+    if not payload:
+        return {}
+    data = orjson.loads(payload)  # orjson.JSONDecodeError is a ValueError
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object")
+    return data
+
 
 class WebSocketManager:
     """Manages WebSocket connections for real-time communication"""
     
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        # Set mutations never await, so they are atomic on the event loop without a lock
+        self.active_connections: Set[WebSocket] = set()
         
     async def connect(self, websocket: WebSocket):
         """Accept a new WebSocket connection"""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
         logger.info(f"New WebSocket connection. Total: {len(self.active_connections)}")
         
     def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection"""
         if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+            self.active_connections.discard(websocket)
             logger.info(f"WebSocket disconnected. Total: {len(self.active_connections)}")
             
+    async def send_json(self, websocket: WebSocket, message: Dict[str, Any]):
+        """Send a JSON message as a text frame, serialized with orjson"""
+        await websocket.send_text(orjson.dumps(message).decode())
+        
+    async def send_pong(self, websocket: WebSocket):
+        """Answer a heartbeat with the pre-serialized pong frame"""
+        await websocket.send_text(PONG_MESSAGE)
+        
+    async def receive_json(self, websocket: WebSocket) -> Dict[str, Any]:
+        """Receive a JSON object sent as either a text or a binary frame; malformed frames raise ValueError"""
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+        
+        payload = message.get("text")
+        if payload is None:
+            payload = message.get("bytes")
+        return parse_json_object(payload)
+            
+    async def receive_frame(self, websocket: WebSocket) -> Union[bytes, Dict[str, Any]]:
+        """Receive one frame: binary frames are returned as raw audio bytes, text frames as a parsed JSON object
+        
+        Malformed text frames raise ValueError, so callers can report them and keep the connection.
+        """
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+        
+        if message.get("bytes") is not None:
+            return message["bytes"]
+        return parse_json_object(message.get("text"))
+            
+    async def send_audio(self, websocket: WebSocket, audio_data: bytes, seq: int, audio_format: str = "wav"):
+        """Send audio as a JSON header frame followed by raw binary frames"""
+        frames = range(0, len(audio_data), AUDIO_FRAME_SIZE)
+        await self.send_json(websocket, {
+            "type": "audio_response_header",
+            "seq": seq,
+            "format": audio_format,
+            "bytes": len(audio_data),
+            "frames": len(frames)
+        })
+        view = memoryview(audio_data)
+        for offset in frames:
+            await websocket.send_bytes(bytes(view[offset:offset + AUDIO_FRAME_SIZE]))
+            
     async def send_personal_message(self, message: str, websocket: WebSocket):
         """Send message to specific WebSocket"""
         try:
@@ -36,15 +101,21 @@ class WebSocketManager:
             self.disconnect(websocket)
             
     async def broadcast(self, message: str):
-        """Broadcast message to all connected WebSockets"""
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting message: {e}")
-                disconnected.append(connection)
-                
+        """Broadcast message to all connected WebSockets concurrently"""
+        await self._broadcast(lambda connection: connection.send_text(message))
+        
+    async def broadcast_json(self, message: Dict[str, Any]):
+        """Broadcast a JSON message, serialized once for all clients"""
+        payload = orjson.dumps(message).decode()
+        await self._broadcast(lambda connection: connection.send_text(payload))
+        
+    async def _broadcast(self, send):
+        """Send to a snapshot of the connections and drop the ones that fail"""
+        targets = list(self.active_connections)
+        results = await asyncio.gather(*(send(connection) for connection in targets), return_exceptions=True)
+        
         # Remove disconnected clients
-        for connection in disconnected:
-            self.disconnect(connection)
\ No newline at end of file
+        for connection, result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error broadcasting message: {result}")
+                self.disconnect(connection)
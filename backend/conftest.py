@@ -0,0 +1,4 @@
+"""
+Pytest root for the backend: its directory is put on sys.path, so tests import
+services/utils/app the same way main.py does
+"""
@@ -4,20 +4,28 @@ State-of-the-art STT-TTS-LLM bridge with real-time voice processing
 """
 
 import asyncio
-import io
+import functools
+import importlib.util
+import json
 import logging
+import re
+import time
+import uuid
+from collections import OrderedDict, deque
 from contextlib import asynccontextmanager
-from typing import List, Dict
+from typing import TYPE_CHECKING, Any, AsyncIterator, Deque, List, Dict, Optional, Tuple, Type
 
+import orjson
 import uvicorn
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, UploadFile, File, Form, Depends, Query, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import Response, StreamingResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
 from app.config import Settings
+from app.middleware import AudioAwareGZipMiddleware
 from app.websocket_manager import WebSocketManager
 from services.stt_service import STTService
 from services.tts_service import TTSService
@@ -25,13 +33,10 @@ from services.llm_service import LLMService
 from services.vibevoice_service import VibeVoiceService
 from services.conversation_engine import ConversationEngine, ConversationStyle, EmotionType
 
-# RTX 5090 GPU Acceleration imports
-try:
+# RTX 5090 GPU Acceleration; onnxruntime is only imported once lifespan enables it
+GPU_ACCELERATION_AVAILABLE = importlib.util.find_spec("onnxruntime") is not None
+if TYPE_CHECKING:
     from services.onnx_acceleration_service import ONNXAccelerationService
-    from utils.onnx_converter import ONNXConverter
-    GPU_ACCELERATION_AVAILABLE = True
-except ImportError:
-    GPU_ACCELERATION_AVAILABLE = False
 from models.voice_models import (
     TranscriptionRequest, 
     TranscriptionResponse,
@@ -56,7 +61,8 @@ class VibeVoiceConversationRequest(BaseModel):
         description="Mapping of speaker names to voice IDs"
     )
     output_format: str = Field(default="wav", description="Output audio format")
-from utils.audio_utils import validate_audio_file
+from utils.audio_utils import MAX_AUDIO_SIZE, validate_audio_file, iter_upload, iter_multipart_audio, silent_wav, encode_opus
+from utils.audio_pool import stt_buffer_pool
 from utils.logging_config import setup_logging
 
 # Setup logging
@@ -70,11 +76,273 @@ settings = Settings()
 stt_service: STTService = None
 tts_service: TTSService = None
 llm_service: LLMService = None
-vibevoice_service: VibeVoiceService = None
-onnx_acceleration_service: ONNXAccelerationService = None
+vibevoice_service: VibeVoiceService = None  # Alias of tts_service.vibevoice_service, the only instance
+onnx_acceleration_service: "ONNXAccelerationService" = None
 conversation_engine: ConversationEngine = None
 websocket_manager = WebSocketManager()
 
+# Bounds concurrent GPU-heavy pipelines; created in lifespan so it binds to the server loop
+_gpu_semaphore: Optional[asyncio.Semaphore] = None
+
+# Last /health result: (monotonic timestamp, HealthResponse)
+_health_cache: Optional[Tuple[float, HealthResponse]] = None
+
+# VibeVoice voice list cache: (voice dir mtime, voice count, voices)
+_voices_cache: Optional[Tuple[float, int, Dict]] = None
+_graph_capture_task: Optional[asyncio.Task] = None
+
+# Bytes read from a text attachment for its prompt preview; covers 500 UTF-8 characters
+_TEXT_PREVIEW_BYTES = 2048
+
+# Full reasoning for recent voice-chat replies whose header metadata only carries a preview
+_REASONING_PREVIEW_CHARS = 1024
+_REASONING_STORE_SIZE = 64
+_reasoning_store: "OrderedDict[str, str]" = OrderedDict()
+
+# Fixed voice-chat prompt prefix; identical across requests so LM Studio can reuse its prompt cache
+_VOICE_CHAT_PRIMER = (
+    {
+        "role": "system", 
+        "content": "You are Ava, a friendly AI assistant. You can analyze text, describe images, and work with various file types. Respond with natural conversational speech. If files are mentioned, acknowledge them and provide helpful responses about their content."
+    },
+    {
+        "role": "user",
+        "content": "Hi Ava"
+    },
+    {
+        "role": "assistant",
+        "content": "Hello! Nice to meet you!"
+    },
+)
+
+# Sentence boundary used to pipeline streamed LLM text into TTS
+_SENTENCE_END_RE = re.compile(r'[.?!]\s*$')
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.?!])\s+')
+_XML_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Markers that mean an LLM response contains XML/HTML rather than conversational text
+_XML_DETECT_RE = re.compile(r'<\?xml|<!doctype|</?html>', re.IGNORECASE)
+
+# All XML/HTML artifacts removed from LLM output, fused so the text is scanned once
+_XML_FILTER_RE = re.compile(
+    r'<\?xml[^>]*\?>'            # XML declarations like <?xml version="1.0" encoding="UTF-8"?>
+    r'|<!DOCTYPE[^>]*>'          # DOCTYPE declarations
+    r'|<[^>]+>'                  # Any XML/HTML tags
+    r'|www\.w3\.org[^\s]*'       # W3 URLs
+    r'|xmlns[^\s]*'              # XML namespaces
+    r'|encoding="[^"]*"'         # Encoding attributes
+    r'|version="[^"]*"'          # Version attributes
+    r'|XML version [0-9\.]+'     # Plain text XML version references
+    r'|encoding [A-Za-z0-9-]+',  # Plain text encoding references
+    re.IGNORECASE
+)
+
+
+class _HeaderSafeTable(dict):
+    """str.translate table: printable ASCII passes through, everything else becomes a space
+    
+    Only the ASCII range (and the quote mappings) is stored; other codepoints come from
+    LLM and user text, so they are answered without caching to keep the table bounded.
+    """
+    
+    def __missing__(self, codepoint: int) -> int:
+        return 32
+
+
+# Typographic quotes in LLM output map to their ASCII forms instead of spaces
+_HEADER_SAFE = _HeaderSafeTable({codepoint: codepoint if 32 <= codepoint <= 126 else 32 for codepoint in range(128)})
+_HEADER_SAFE.update({0x2018: "'", 0x2019: "'", 0x201C: '"', 0x201D: '"'})
+
+# Custom headers the frontend may read (CORS Access-Control-Expose-Headers values)
+_VOICE_CHAT_EXPOSE_HEADERS = (
+    "X-Transcript,X-LLM-Response,X-LLM-Reasoning,X-LLM-Model,X-LLM-Tokens,X-LLM-Processing-Time,"
+    "X-TTS-Processing-Time,X-Used-Files,X-Primary-File,X-File-Count,X-Voice-Bridge-Data"
+)
+_VOICE_CHAT_STREAM_EXPOSE_HEADERS = "X-Transcript,X-LLM-Model,X-File-Count"
+_VOICE_CLONE_TEST_EXPOSE_HEADERS = "X-Voice-Clone-ID,X-Test-Text"
+_VOICE_CLONE_CACHED_EXPOSE_HEADERS = "X-Voice-Clone-ID,X-Test-Text,X-Cached-Audio,X-Cache-Timestamp"
+
+# Static response headers, copied per request and filled in with the per-reply values
+_VOICE_CHAT_HEADERS = {
+    "Content-Disposition": "inline; filename=voice_response.wav",
+    # CORS headers to allow frontend to access our custom headers
+    "Access-Control-Expose-Headers": _VOICE_CHAT_EXPOSE_HEADERS
+}
+_VOICE_CLONE_TEST_HEADERS = {"Access-Control-Expose-Headers": _VOICE_CLONE_TEST_EXPOSE_HEADERS}
+
+
+def header_json(value) -> str:
+    """Serialize to JSON for a response header; non-ASCII output falls back to escaped stdlib json"""
+    payload = orjson.dumps(value)
+    if payload.isascii():
+        return payload.decode("ascii")
+    return json.dumps(value, ensure_ascii=True)
+
+
+# Upper bound for any header built from user/LLM text
+_MAX_HEADER_LENGTH = 8192
+
+
+def clean_for_header(text: str, max_length: Optional[int] = None) -> str:
+    """Clean text for HTTP headers while preserving punctuation"""
+    if not text:
+        return ""
+    
+    max_length = min(max_length or _MAX_HEADER_LENGTH, _MAX_HEADER_LENGTH)
+    
+    # Bound the work on long LLM output before cleaning (whitespace collapse only shrinks it)
+    text = text[:max_length * 4]
+    
+    # Single C-level pass: control characters, newlines and non-ASCII become spaces
+    cleaned = ' '.join(text.translate(_HEADER_SAFE).split())
+    
+    if len(cleaned) > max_length:
+        cleaned = cleaned[:max_length].rsplit(' ', 1)[0] + "..."
+    
+    return cleaned
+
+
+def gpu_bound(handler):
+    """Limit how many requests run a GPU-heavy endpoint at once"""
+    @functools.wraps(handler)
+    async def wrapper(*args, **kwargs):
+        async with _gpu_semaphore:
+            return await handler(*args, **kwargs)
+    return wrapper
+
+
+async def gpu_bound_stream(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Hold a GPU slot for the lifetime of a streamed response"""
+    async with _gpu_semaphore:
+        async for chunk in stream:
+            yield chunk
+
+
+async def iter_sentences(tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Regroup streamed LLM tokens into tag-free sentences for incremental TTS"""
+    buffer = ""
+    async for token in tokens:
+        buffer += token
+        if _SENTENCE_END_RE.search(buffer):
+            sentence = _XML_TAG_RE.sub('', buffer).strip()
+            buffer = ""
+            if sentence:
+                yield sentence
+    tail = _XML_TAG_RE.sub('', buffer).strip()
+    if tail:
+        yield tail
+
+
+async def negotiate_audio(request: Request, audio_data: bytes) -> Tuple[bytes, str, str]:
+    """Re-encode large WAV responses as Ogg/Opus when the client accepts it
+
+    PCM barely shrinks under gzip, so big replies are transcoded instead.
+    Returns (content, media_type, file extension).
+    """
+    accept = request.headers.get("accept", "")
+    if len(audio_data) >= settings.opus_min_bytes and ("audio/ogg" in accept or "audio/opus" in accept):
+        try:
+            return await asyncio.to_thread(encode_opus, audio_data), "audio/ogg", "ogg"
+        except Exception as e:
+            logger.warning(f"⚠️ Opus encoding failed, sending WAV: {e}")
+    return audio_data, "audio/wav", "wav"
+
+
+async def iter_voice_to_llm_events(
+    stt_result: Dict,
+    messages: List[Dict[str, str]],
+    model: str,
+    temperature: float,
+    max_tokens: int
+) -> AsyncIterator[bytes]:
+    """NDJSON events for streamed voice-to-LLM: transcript, LLM text deltas, then a summary"""
+    yield orjson.dumps({
+        "type": "transcript",
+        "text": stt_result["text"],
+        "language": stt_result.get("language", "unknown"),
+        "confidence": stt_result.get("confidence", 0),
+        "processing_time": stt_result.get("processing_time", 0)
+    }) + b"\n"
+    
+    start_time = time.monotonic()
+    async for chunk in llm_service.generate_streaming_response(
+        messages=messages, model=model, temperature=temperature, max_tokens=max_tokens
+    ):
+        if chunk["type"] == "chunk":
+            event = {"type": "token", "text": chunk["content"]}
+        elif chunk["type"] == "complete":
+            event = {
+                "type": "done",
+                "text": chunk["content"],
+                "model": chunk.get("model", model),
+                "processing_time": time.monotonic() - start_time
+            }
+        else:
+            event = {"type": "error", "message": chunk.get("error", "LLM streaming failed")}
+        yield orjson.dumps(event) + b"\n"
+
+
+def json_body(model: Type[BaseModel]):
+    """Dependency that validates the raw JSON body in one pass with model_validate_json"""
+    async def parse(request: Request) -> BaseModel:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            # Same 422 shape as FastAPI's own body validation: locations start with "body"
+            raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors()])
+    return parse
+
+
+def _inline_schema_refs(node: Any, defs: Dict[str, Any]) -> Any:
+    """Replace pydantic's local "#/$defs/..." references, which don't resolve inside an OpenAPI document"""
+    if isinstance(node, dict):
+        ref = node.get("$ref", "")
+        if ref.startswith("#/$defs/"):
+            return _inline_schema_refs(defs[ref[len("#/$defs/"):]], defs)
+        return {key: _inline_schema_refs(value, defs) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_inline_schema_refs(item, defs) for item in node]
+    return node
+
+
+def json_body_openapi(model: Type[BaseModel]) -> Dict:
+    """openapi_extra documenting a json_body() model, which FastAPI can't see through Depends"""
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _inline_schema_refs(schema, defs)}}
+        }
+    }
+
+
+def get_vibevoice_service() -> VibeVoiceService:
+    """Dependency returning the VibeVoice service behind the TTS service, or 503 when it is missing"""
+    service = getattr(tts_service, "vibevoice_service", None)
+    if not service:
+        raise HTTPException(status_code=503, detail="VibeVoice service not available")
+    return service
+
+
+async def warmup_services() -> None:
+    """Send tiny dummy requests so the first real request runs at steady-state speed"""
+    logger.info("🔥 Warming up services...")
+    start_time = time.time()
+    
+    # TTS already synthesizes a test phrase during initialize()
+    warmups = [stt_service.transcribe(silent_wav(1.0)), llm_service.prewarm(messages=_VOICE_CHAT_PRIMER)]
+    if tts_service.vibevoice_service:
+        # The TTS-owned instance is the one that serves /tts and conversation requests
+        warmups.append(tts_service.vibevoice_service.warmup_and_capture(use_cuda_graphs=settings.vibevoice_cuda_graphs))
+    results = await asyncio.gather(*warmups, return_exceptions=True)
+    for name, result in zip(("STT", "LLM", "VibeVoice"), results):
+        if isinstance(result, BaseException):
+            logger.warning(f"⚠️ {name} warmup failed: {result}")
+    
+    logger.info(f"✅ Warmup complete in {time.time() - start_time:.2f}s")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -82,39 +350,51 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Starting Ultimate Voice Bridge...")
     
-    global stt_service, tts_service, llm_service, vibevoice_service, onnx_acceleration_service, conversation_engine
+    global stt_service, tts_service, llm_service, vibevoice_service, onnx_acceleration_service, conversation_engine, _voices_cache, _gpu_semaphore, _graph_capture_task
+    
+    _gpu_semaphore = asyncio.Semaphore(max(1, settings.max_gpu_concurrency))
     
     # Initialize services
     try:
-        stt_service = STTService()
-        await stt_service.initialize()
-        logger.info("✅ STT Service initialized")
+        stt_buffer_pool.preallocate(settings.audio_buffer_pool_size)
         
+        stt_service = STTService()
         tts_service = TTSService()
-        await tts_service.initialize()
-        logger.info("✅ TTS Service initialized")
-        
         llm_service = LLMService()
-        await llm_service.initialize()
-        logger.info("✅ LLM Service initialized")
+        
+        # Load independent services concurrently so startup costs max(), not sum()
+        core_services = {"STT": stt_service, "TTS": tts_service, "LLM": llm_service}
+        results = await asyncio.gather(
+            *(service.initialize() for service in core_services.values()),
+            return_exceptions=True
+        )
+        
+        failures = []
+        for name, result in zip(core_services, results):
+            if isinstance(result, BaseException):
+                logger.error(f"❌ {name} Service failed to initialize: {result}")
+                failures.append(result)
+            else:
+                logger.info(f"✅ {name} Service initialized")
+        if failures:
+            raise failures[0]
+        
+        # One VibeVoice instance: the TTS-owned one holds the model cache, batcher and warmed-up graphs
+        vibevoice_service = tts_service.vibevoice_service
+        if vibevoice_service:
+            conversation_engine = ConversationEngine(vibevoice_service)
+            logger.info("✅ Multi-Speaker Conversation Engine initialized")
         
         # Initialize RTX 5090 GPU Acceleration (if available)
         if GPU_ACCELERATION_AVAILABLE and settings.gpu_acceleration_enabled:
             logger.info("🚀 Initializing RTX 5090 GPU Acceleration...")
             try:
+                from services.onnx_acceleration_service import ONNXAccelerationService
+                
                 onnx_acceleration_service = ONNXAccelerationService()
                 await onnx_acceleration_service.initialize()
                 logger.info("✅ RTX 5090 GPU Acceleration initialized successfully!")
                 
-                # Initialize VibeVoice with GPU acceleration
-                vibevoice_service = VibeVoiceService()
-                await vibevoice_service.initialize()
-                logger.info("✅ VibeVoice with GPU Acceleration initialized")
-                
-                # Initialize ConversationEngine with VibeVoice
-                conversation_engine = ConversationEngine(vibevoice_service)
-                logger.info("✅ Multi-Speaker Conversation Engine initialized")
-                
                 # Log GPU info
                 if onnx_acceleration_service.device_info:
                     gpu_name = onnx_acceleration_service.device_info.get('gpu_name', 'Unknown')
@@ -125,13 +405,16 @@ async def lifespan(app: FastAPI):
                 logger.warning(f"⚠️ RTX 5090 GPU acceleration initialization failed: {e}")
                 logger.info("🚑 Falling back to CPU-only operation")
                 onnx_acceleration_service = None
-                vibevoice_service = None
         else:
             if not GPU_ACCELERATION_AVAILABLE:
                 logger.info("💻 GPU acceleration libraries not available - running CPU-only")
             else:
                 logger.info("💻 GPU acceleration disabled in settings - running CPU-only")
         
+        # Pay first-inference costs (kernel compilation, LM Studio model load) before serving
+        if settings.warmup_on_start:
+            await warmup_services()
+        
         logger.info("🎤️ Ultimate Voice Bridge is ready!")
         
         # Display startup summary
@@ -147,6 +430,10 @@ async def lifespan(app: FastAPI):
         for status in startup_summary:
             logger.info(f"   {status}")
         
+        # Full-batch CUDA graphs take several generations to record, so capture them while serving
+        if settings.warmup_on_start and settings.vibevoice_cuda_graphs and vibevoice_service:
+            _graph_capture_task = asyncio.create_task(vibevoice_service.capture_batch_graphs())
+        
     except Exception as e:
         logger.error(f"❌ Failed to initialize services: {e}")
         raise
@@ -156,17 +443,21 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Shutting down Ultimate Voice Bridge...")
     
-    if stt_service:
-        await stt_service.cleanup()
-    if tts_service:
-        await tts_service.cleanup()
-    if llm_service:
-        await llm_service.cleanup()
+    _voices_cache = None
+    
+    if _graph_capture_task and not _graph_capture_task.done():
+        _graph_capture_task.cancel()
+        await asyncio.gather(_graph_capture_task, return_exceptions=True)
+    
+    cleanup_results = await asyncio.gather(
+        *(service.cleanup() for service in (stt_service, tts_service, llm_service) if service),
+        return_exceptions=True
+    )
+    for result in cleanup_results:
+        if isinstance(result, BaseException):
+            logger.error(f"❌ Service cleanup failed: {result}")
     
-    # Cleanup RTX 5090 GPU Acceleration services
-    if vibevoice_service:
-        await vibevoice_service.cleanup()
-        logger.info("✅ VibeVoice GPU service cleaned up")
+    # Cleanup RTX 5090 GPU Acceleration services (VibeVoice is cleaned up by tts_service)
     if onnx_acceleration_service:
         await onnx_acceleration_service.cleanup()
         logger.info("✅ RTX 5090 GPU acceleration service cleaned up")
@@ -181,6 +472,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -193,79 +485,93 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(AudioAwareGZipMiddleware, minimum_size=1000)
 
 # Mount static files for audio samples (optional)
 # app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
+# Static API index, serialized once at import
+_ROOT_PAYLOAD = orjson.dumps({
+    "message": "🎙️ Ultimate Voice Bridge API",
+    "version": "1.0.0",
+    "description": "State-of-the-art STT-TTS-LLM bridge",
+    "endpoints": {
+        "health": "/health",
+        "stt": "/api/v1/stt",
+        "tts": "/api/v1/tts", 
+        "llm": "/api/v1/llm",
+        "models": "/api/v1/models",
+        "voice_chat": "/api/v1/voice-chat",
+        "voice_to_llm": "/api/v1/voice-to-llm",
+        "vibevoice_conversation": "/api/v1/vibevoice-conversation",
+        "vibevoice_voices": "/api/v1/vibevoice-voices",
+        "voice_clone": "/api/v1/voice-clone",
+        "voice_clone_test": "/api/v1/voice-clone/test",
+        "voice_clones_list": "/api/v1/voice-clones",
+        "conversation_create": "/api/v1/conversation/create",
+        "conversation_styles": "/api/v1/conversation/styles",
+        "conversation_emotions": "/api/v1/conversation/emotions",
+        "conversation_analytics": "/api/v1/conversation/analytics",
+        "conversation_clear_history": "/api/v1/conversation/clear-history",
+        "websocket": "/ws",
+        "voice_chat_websocket": "/ws/voice-chat",
+        "docs": "/docs"
+    },
+    "status": "ready"
+})
+
+
 @app.get("/", response_model=dict)
 async def root():
     """Root endpoint with API information"""
-    return {
-        "message": "🎙️ Ultimate Voice Bridge API",
-        "version": "1.0.0",
-        "description": "State-of-the-art STT-TTS-LLM bridge",
-        "endpoints": {
-            "health": "/health",
-            "stt": "/api/v1/stt",
-            "tts": "/api/v1/tts", 
-            "llm": "/api/v1/llm",
-            "models": "/api/v1/models",
-            "voice_chat": "/api/v1/voice-chat",
-            "voice_to_llm": "/api/v1/voice-to-llm",
-            "vibevoice_conversation": "/api/v1/vibevoice-conversation",
-            "vibevoice_voices": "/api/v1/vibevoice-voices",
-            "voice_clone": "/api/v1/voice-clone",
-            "voice_clone_test": "/api/v1/voice-clone/test",
-            "voice_clones_list": "/api/v1/voice-clones",
-            "conversation_create": "/api/v1/conversation/create",
-            "conversation_styles": "/api/v1/conversation/styles",
-            "conversation_emotions": "/api/v1/conversation/emotions",
-            "conversation_analytics": "/api/v1/conversation/analytics",
-            "conversation_clear_history": "/api/v1/conversation/clear-history",
-            "websocket": "/ws",
-            "docs": "/docs"
-        },
-        "status": "ready"
-    }
+    return Response(content=_ROOT_PAYLOAD, media_type="application/json")
 
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (probes are cached for HEALTH_CACHE_TTL seconds)"""
+    global _health_cache
+    
+    now = time.monotonic()
+    if _health_cache is not None and now - _health_cache[0] < settings.health_cache_ttl:
+        return _health_cache[1]
+    
     try:
-        # Check service health
-        stt_healthy = await stt_service.health_check() if stt_service else False
-        tts_healthy = await tts_service.health_check() if tts_service else False
-        llm_healthy = await llm_service.health_check() if llm_service else False
+        # Probe all services concurrently; a failed probe counts as unhealthy
+        async def probe(service, check):
+            return await check(service) if service else None
+        
+        stt_healthy, tts_healthy, llm_healthy, gpu_metrics, vibevoice_gpu_healthy = await asyncio.gather(
+            probe(stt_service, lambda s: s.health_check()),
+            probe(tts_service, lambda s: s.health_check()),
+            probe(llm_service, lambda s: s.health_check()),
+            probe(onnx_acceleration_service, lambda s: s.get_performance_metrics()),
+            probe(vibevoice_service, lambda s: s.health_check()),
+            return_exceptions=True
+        )
+        stt_healthy, tts_healthy, llm_healthy = (
+            result is True for result in (stt_healthy, tts_healthy, llm_healthy)
+        )
         
         # Check GPU acceleration health
         gpu_acceleration_healthy = False  # Default to False
-        vibevoice_gpu_healthy = True
-        
-        if onnx_acceleration_service:
-            try:
-                gpu_metrics = await onnx_acceleration_service.get_performance_metrics()
-                gpu_acceleration_healthy = gpu_metrics.get('status') in ['healthy', 'degraded']
-                logger.info(f"🎮 GPU acceleration status: {gpu_metrics.get('status_detail', 'Unknown')}")
-            except Exception as e:
-                logger.warning(f"⚠️ GPU acceleration health check failed: {e}")
-                gpu_acceleration_healthy = False
+        if isinstance(gpu_metrics, dict):
+            gpu_acceleration_healthy = gpu_metrics.get('status') in ['healthy', 'degraded']
+            logger.info(f"🎮 GPU acceleration status: {gpu_metrics.get('status_detail', 'Unknown')}")
+        elif isinstance(gpu_metrics, Exception):
+            logger.warning(f"⚠️ GPU acceleration health check failed: {gpu_metrics}")
         else:
             logger.info("💻 ONNX acceleration service not initialized")
         
-        if vibevoice_service:
-            try:
-                vibevoice_gpu_healthy = await vibevoice_service.health_check()
-            except:
-                vibevoice_gpu_healthy = False
+        # VibeVoice GPU counts as healthy when the service isn't running
+        vibevoice_gpu_healthy = vibevoice_gpu_healthy is None or vibevoice_gpu_healthy is True
         
         overall_healthy = stt_healthy and tts_healthy and llm_healthy
         
-        return HealthResponse(
+        response = HealthResponse(
             status="healthy" if overall_healthy else "degraded",
-            timestamp=asyncio.get_event_loop().time(),
+            timestamp=now,
             services={
                 "stt": "healthy" if stt_healthy else "unhealthy",
                 "tts": "healthy" if tts_healthy else "unhealthy", 
@@ -275,12 +581,14 @@ async def health_check():
             },
             version="1.0.0"
         )
+        _health_cache = (now, response)
+        return response
         
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         return HealthResponse(
             status="unhealthy",
-            timestamp=asyncio.get_event_loop().time(),
+            timestamp=now,
             services={
                 "stt": "unknown",
                 "tts": "unknown",
@@ -302,11 +610,8 @@ async def speech_to_text(
         if not validate_audio_file(audio):
             raise HTTPException(status_code=400, detail="Invalid audio file format")
         
-        # Read audio data
-        audio_data = await audio.read()
-        
-        # Transcribe using STT service
-        result = await stt_service.transcribe(audio_data, language=language)
+        # Stream the upload into the STT service
+        result = await stt_service.transcribe_stream(iter_upload(audio), language=language)
         
         return TranscriptionResponse(**result)
         
@@ -315,23 +620,49 @@ async def speech_to_text(
         raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
 
 
-@app.post("/api/v1/tts")
-async def text_to_speech(request: TTSRequest):
+@app.post("/api/v1/tts", openapi_extra=json_body_openapi(TTSRequest))
+async def text_to_speech(
+    http_request: Request,
+    request: TTSRequest = Depends(json_body(TTSRequest)),
+    stream: bool = Query(False, description="Stream WAV sentence-by-sentence; no Opus, no timing header, errors truncate the audio")
+):
     """Convert text to speech using Coqui TTS"""
     try:
+        sentences = [s for s in _SENTENCE_SPLIT_RE.split(request.text.strip()) if s] if stream else []
+        if len(sentences) > 1:
+            # Opt-in: start sending audio once the first sentence is synthesized
+            async def sentence_stream():
+                for sentence in sentences:
+                    yield sentence
+            
+            return StreamingResponse(
+                gpu_bound_stream(tts_service.generate_speech_stream(
+                    sentence_stream(),
+                    voice=request.voice,
+                    speed=request.speed,
+                    pitch=request.pitch
+                )),
+                media_type="audio/wav",
+                headers={"Content-Disposition": "inline; filename=speech.wav"}
+            )
+        
         # Generate speech using TTS service
-        audio_data = await tts_service.generate_speech(
+        tts_result = await tts_service.synthesize(
             text=request.text,
             voice=request.voice,
             speed=request.speed,
             pitch=request.pitch
         )
         
-        # Return audio file as streaming response
-        return StreamingResponse(
-            io.BytesIO(audio_data),
-            media_type="audio/wav",
-            headers={"Content-Disposition": "inline; filename=speech.wav"}
+        # Return the complete audio in one response
+        content, media_type, extension = await negotiate_audio(http_request, tts_result.audio)
+        return Response(
+            content=content,
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f"inline; filename=speech.{extension}",
+                "X-TTS-Processing-Time": f"{tts_result.processing_time:.3f}"
+            }
         )
         
     except Exception as e:
@@ -346,6 +677,41 @@ class VoiceTestRequest(BaseModel):
     speaker_name: str = Field(default="Test Speaker", description="Speaker name for testing")
 
 
+def _voice_test_response(request: VoiceTestRequest, audio_data: bytes, engine: str) -> Response:
+    """Wrap voice test audio with the headers the voice library UI reads"""
+    return Response(
+        content=audio_data,
+        media_type="audio/wav",
+        headers={
+            "Content-Disposition": f"inline; filename=voice_test_{request.voice_id}.wav",
+            "X-Voice-ID": request.voice_id,
+            "X-Speaker-Name": request.speaker_name,
+            "X-Voice-Engine": engine
+        }
+    )
+
+
+async def _test_vibevoice_voice(request: VoiceTestRequest) -> Optional[Response]:
+    """Voice test through VibeVoice; None falls back to standard TTS"""
+    if not vibevoice_service:
+        logger.warning("⚠️ VibeVoice service not available, falling back to regular TTS")
+        return None
+    
+    logger.info(f"🎵 Using VibeVoice service for voice: {request.voice_id}")
+    
+    # Single-voice test: speaker_name is free text, so it can't go through the conversation script parser
+    audio_data = await vibevoice_service.generate_speech(text=request.text, voice=request.voice_id)
+    
+    logger.info(f"✅ VibeVoice test audio generated: {len(audio_data)} bytes")
+    return _voice_test_response(request, audio_data, "VibeVoice")
+
+
+# Voice ID prefix -> engine-specific test handler; unmatched voices use standard TTS
+_VOICE_TEST_ENGINES = (
+    ("vibevoice-", _test_vibevoice_voice),
+)
+
+
 @app.post("/api/v1/tts/test-voice")
 async def test_voice(request: VoiceTestRequest):
     """Test a specific voice with given text - supports both VibeVoice and custom voice clones"""
@@ -353,67 +719,31 @@ async def test_voice(request: VoiceTestRequest):
         logger.info(f"🎤 Testing voice: {request.voice_id} for speaker: {request.speaker_name}")
         logger.info(f"📝 Test text: '{request.text[:100]}{'...' if len(request.text) > 100 else ''}'")
         
-        # Check if it's a VibeVoice voice (vibevoice- prefix)
-        if request.voice_id.startswith('vibevoice-'):
-            # Use VibeVoice service if available
-            if vibevoice_service:
-                logger.info(f"🎵 Using VibeVoice service for voice: {request.voice_id}")
-                
-                # Create a simple single-speaker conversation for testing
-                test_script = f"{request.speaker_name}: {request.text}"
-                speaker_mapping = {request.speaker_name: request.voice_id}
-                
-                # Generate audio using VibeVoice
-                audio_data = await vibevoice_service.generate_conversation(
-                    script=test_script,
-                    speaker_mapping=speaker_mapping,
-                    conversation_style="natural"
-                )
-                
-                logger.info(f"✅ VibeVoice test audio generated: {len(audio_data)} bytes")
-                
-                return StreamingResponse(
-                    io.BytesIO(audio_data),
-                    media_type="audio/wav",
-                    headers={
-                        "Content-Disposition": f"inline; filename=voice_test_{request.voice_id}.wav",
-                        "X-Voice-ID": request.voice_id,
-                        "X-Speaker-Name": request.speaker_name,
-                        "X-Voice-Engine": "VibeVoice"
-                    }
-                )
-            else:
-                logger.warning("⚠️ VibeVoice service not available, falling back to regular TTS")
+        for prefix, handler in _VOICE_TEST_ENGINES:
+            if request.voice_id.startswith(prefix):
+                response = await handler(request)
+                if response is not None:
+                    return response
+                break
         
-        # Fallback to regular TTS service for other voices or if VibeVoice fails
+        # Fallback to regular TTS service for other voices or if the engine is unavailable
         logger.info(f"🎵 Using standard TTS service for voice: {request.voice_id}")
         
-        # Generate speech using standard TTS service
         audio_data = await tts_service.generate_speech(
             text=request.text,
             voice=request.voice_id
         )
         
         logger.info(f"✅ Standard TTS test audio generated: {len(audio_data)} bytes")
-        
-        return StreamingResponse(
-            io.BytesIO(audio_data),
-            media_type="audio/wav",
-            headers={
-                "Content-Disposition": f"inline; filename=voice_test_{request.voice_id}.wav",
-                "X-Voice-ID": request.voice_id,
-                "X-Speaker-Name": request.speaker_name,
-                "X-Voice-Engine": "Standard TTS"
-            }
-        )
+        return _voice_test_response(request, audio_data, "Standard TTS")
         
     except Exception as e:
         logger.error(f"Voice test error for {request.voice_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Voice test failed: {str(e)}")
 
 
-@app.post("/api/v1/llm", response_model=LLMResponse)
-async def chat_completion(request: LLMRequest):
+@app.post("/api/v1/llm", response_model=LLMResponse, openapi_extra=json_body_openapi(LLMRequest))
+async def chat_completion(request: LLMRequest = Depends(json_body(LLMRequest))):
     """Generate LLM response"""
     try:
         # Generate response using LLM service
@@ -432,6 +762,7 @@ async def chat_completion(request: LLMRequest):
 
 
 @app.post("/api/v1/voice-to-llm")
+@gpu_bound
 async def voice_to_llm_pipeline(
     audio: UploadFile = File(..., description="Audio file with user's voice message"),
     model: str = Form("bytedance/seed-oss-36b", description="LLM model to use"),
@@ -439,14 +770,17 @@ async def voice_to_llm_pipeline(
     temperature: float = Form(0.7, description="LLM temperature"),
     max_tokens: int = Form(2000, description="Maximum tokens for LLM response"),
     include_reasoning: bool = Form(True, description="Include reasoning for reasoning models"),
-    use_conversation_history: bool = Form(True, description="Use conversation context")
+    use_conversation_history: bool = Form(True, description="Use conversation context"),
+    stream: bool = Form(False, description="Stream NDJSON events: the transcript first, then LLM text as it generates")
 ):
     """Voice-to-LLM pipeline: STT -> OSS36B LLM (optimized for voice conversation)"""
     try:
-        # Step 1: Speech to Text
+        # Step 1: Speech to Text, while making sure the LLM is loaded
         logger.info("🎤 Starting Voice-to-LLM pipeline")
-        audio_data = await audio.read()
-        stt_result = await stt_service.transcribe(audio_data, language=language)
+        stt_result, _ = await asyncio.gather(
+            stt_service.transcribe_stream(iter_upload(audio), language=language),
+            llm_service.prewarm(model)
+        )
         
         if not stt_result.get("text") or not stt_result["text"].strip():
             raise HTTPException(status_code=400, detail="No speech detected in audio")
@@ -456,6 +790,15 @@ async def voice_to_llm_pipeline(
         
         # Step 2: Generate LLM response with OSS36B
         messages = [{"role": "user", "content": transcribed_text}]
+        
+        if stream:
+            # The client can show the transcript while the LLM is still prefilling
+            # @gpu_bound releases its slot when the handler returns, so the stream takes its own
+            return StreamingResponse(
+                gpu_bound_stream(iter_voice_to_llm_events(stt_result, messages, model, temperature, max_tokens)),
+                media_type="application/x-ndjson"
+            )
+        
         llm_result = await llm_service.generate_response(
             messages=messages,
             model=model,
@@ -500,7 +843,9 @@ async def voice_to_llm_pipeline(
 
 
 @app.post("/api/v1/voice-chat")
+@gpu_bound
 async def voice_chat_pipeline(
+    http_request: Request,
     # Optional audio file for voice input
     audio: UploadFile = File(None, description="Audio file with user's voice message (optional)"),
     # Optional text input for direct text processing
@@ -511,31 +856,14 @@ async def voice_chat_pipeline(
     voice: str = Form("default", description="TTS voice to use for response"),
     model: str = Form("default", description="LLM model to use (legacy support)"),
     language: str = Form("auto", description="STT language"),
+    stream: bool = Form(False, description="Stream audio sentence-by-sentence as the LLM generates"),
+    metadata_in_body: bool = Form(False, description="Return metadata as a JSON part of a multipart/mixed body instead of headers"),
     # Primary file selection and metadata
     primary_file_index: int = Form(None, description="Index of primary file for analysis"),
     total_files: int = Form(0, description="Total number of files uploaded"),
     # Multimodal file support
-    file_0: UploadFile = File(None, description="Additional file 0"),
-    file_1: UploadFile = File(None, description="Additional file 1"),
-    file_2: UploadFile = File(None, description="Additional file 2"),
-    file_3: UploadFile = File(None, description="Additional file 3"),
-    file_4: UploadFile = File(None, description="Additional file 4"),
-    # File metadata
-    file_0_name: str = Form(None, description="Name of file 0"),
-    file_0_type: str = Form(None, description="MIME type of file 0"),
-    file_0_is_primary: bool = Form(False, description="Whether file 0 is primary"),
-    file_1_name: str = Form(None, description="Name of file 1"),
-    file_1_type: str = Form(None, description="MIME type of file 1"),
-    file_1_is_primary: bool = Form(False, description="Whether file 1 is primary"),
-    file_2_name: str = Form(None, description="Name of file 2"),
-    file_2_type: str = Form(None, description="MIME type of file 2"),
-    file_2_is_primary: bool = Form(False, description="Whether file 2 is primary"),
-    file_3_name: str = Form(None, description="Name of file 3"),
-    file_3_type: str = Form(None, description="MIME type of file 3"),
-    file_3_is_primary: bool = Form(False, description="Whether file 3 is primary"),
-    file_4_name: str = Form(None, description="Name of file 4"),
-    file_4_type: str = Form(None, description="MIME type of file 4"),
-    file_4_is_primary: bool = Form(False, description="Whether file 4 is primary")
+    files: List[UploadFile] = File(None, description="Additional files"),
+    file_metadata_json: str = Form("[]", description="JSON list of {name, type, is_primary} per file")
 ):
     """Complete multimodal chat pipeline: (STT + Files + Text) -> LLM -> TTS"""
     try:
@@ -543,7 +871,7 @@ async def voice_chat_pipeline(
         
         # Determine the actual model to use (prioritize selected_model)
         actual_model = selected_model if selected_model != "default" else model
-        logger.info(f"🤖 Using model: {actual_model}")
+        logger.info("🤖 Using model: %s", actual_model)
         
         user_content = ""
         stt_result = None
@@ -552,20 +880,19 @@ async def voice_chat_pipeline(
         if audio and audio.filename:
             # Voice input - use STT
             logger.info("🎤 Processing audio input with STT")
-            audio_data = await audio.read()
-            stt_result = await stt_service.transcribe(audio_data, language=language)
+            stt_result = await stt_service.transcribe_stream(iter_upload(audio), language=language)
             
             if not stt_result.get("text"):
                 raise HTTPException(status_code=400, detail="No speech detected in audio")
             
             user_content = stt_result["text"]
-            logger.info(f"📝 Voice Chat STT result: '{user_content}'")
+            logger.info("📝 Voice Chat STT result: '%s'", user_content)
             
         elif text_input and text_input.strip():
             # Text input - use directly
             logger.info("📝 Processing text input directly")
             user_content = text_input.strip()
-            logger.info(f"📝 Text input: '{user_content}'")
+            logger.info("📝 Text input: '%s'", user_content)
             
             # Create a mock STT result for consistency
             stt_result = {
@@ -577,7 +904,7 @@ async def voice_chat_pipeline(
             }
         else:
             # Check if we have any files - allow file-only submissions
-            has_files = any(f and f.filename for f in [file_0, file_1, file_2, file_3, file_4])
+            has_files = any(f.filename for f in files or [])
             if not has_files:
                 raise HTTPException(status_code=400, detail="Either audio file, text_input, or uploaded files must be provided")
             
@@ -595,90 +922,111 @@ async def voice_chat_pipeline(
             }
         
         # Step 1.5: Process any additional files with primary file awareness
-        uploaded_files = []
         file_descriptions = []
         primary_file_description = None
         used_files = []
         
         # Create mapping of metadata
-        file_metadata = [
-            (file_0, file_0_name, file_0_type, file_0_is_primary),
-            (file_1, file_1_name, file_1_type, file_1_is_primary),
-            (file_2, file_2_name, file_2_type, file_2_is_primary),
-            (file_3, file_3_name, file_3_type, file_3_is_primary),
-            (file_4, file_4_name, file_4_type, file_4_is_primary)
-        ]
+        try:
+            metadata = orjson.loads(file_metadata_json)
+        except orjson.JSONDecodeError:
+            metadata = None
+        if not isinstance(metadata, list):
+            raise HTTPException(status_code=400, detail="file_metadata_json must be a JSON list")
+        if not all(isinstance(entry, dict) for entry in metadata):
+            raise HTTPException(status_code=400, detail="file_metadata_json entries must be JSON objects")
+        
+        # One pass: skip empty upload slots and pair each file with its metadata entry
+        present_files = []
+        for i, file_param in enumerate(files or []):
+            if not (file_param and file_param.filename):
+                continue
+            meta = metadata[i] if i < len(metadata) else {}
+            present_files.append((i, (
+                file_param,
+                meta.get("name"),
+                meta.get("type"),
+                bool(meta.get("is_primary", i == primary_file_index))
+            )))
+        
+        # Only text files contribute content (a short preview); other files are described by name and type,
+        # so their bodies are never read
+        async def read_preview(file_param: UploadFile, file_type: Optional[str]) -> Optional[bytes]:
+            actual_type = file_type or file_param.content_type
+            if actual_type and actual_type.startswith('text/'):
+                return await file_param.read(_TEXT_PREVIEW_BYTES)
+            return None
+        
+        previews = await asyncio.gather(*(read_preview(entry[0], entry[2]) for _, entry in present_files))
+        
+        for (i, (file_param, file_name, file_type, is_primary)), preview in zip(present_files, previews):
+            # Use provided metadata if available, otherwise fallback to file attributes
+            actual_name = file_name or file_param.filename
+            actual_type = file_type or file_param.content_type
+            
+            logger.info("📁 Processing file %d: %s (%s) %s", i, actual_name, actual_type, "[PRIMARY]" if is_primary else "")
+            
+            used_files.append({
+                "index": i,
+                "name": actual_name,
+                "type": actual_type,
+                "is_primary": is_primary
+            })
+            
+            # Create description for LLM based on file type
+            if actual_type and actual_type.startswith('image/'):
+                description = f"[{'PRIMARY ' if is_primary else ''}Image: {actual_name}]"
+            elif actual_type == 'application/pdf':
+                description = f"[{'PRIMARY ' if is_primary else ''}PDF: {actual_name}]"
+            elif preview is not None:
+                # A cut codepoint at the end of the preview window is replaced, not fatal
+                text_content = preview.decode('utf-8', errors='replace')[:500]
+                description = f"[{'PRIMARY ' if is_primary else ''}Text file '{actual_name}': {text_content}...]"
+            else:
+                description = f"[{'PRIMARY ' if is_primary else ''}File: {actual_name} ({actual_type})]"
+            
+            if is_primary:
+                primary_file_description = description
+                logger.info("🎯 Primary file identified: %s", actual_name)
+            
+            file_descriptions.append(description)
         
-        for i, (file_param, file_name, file_type, is_primary) in enumerate(file_metadata):
-            if file_param and file_param.filename:
-                # Use provided metadata if available, otherwise fallback to file attributes
-                actual_name = file_name or file_param.filename
-                actual_type = file_type or file_param.content_type
-                
-                logger.info(f"📁 Processing file {i}: {actual_name} ({actual_type}) {'[PRIMARY]' if is_primary else ''}")
-                
-                # Read file content
-                file_content = await file_param.read()
-                uploaded_files.append(file_content)
-                used_files.append({
-                    "index": i,
-                    "name": actual_name,
-                    "type": actual_type,
-                    "is_primary": is_primary
-                })
-                
-                # Create description for LLM based on file type
-                if actual_type and actual_type.startswith('image/'):
-                    description = f"[{'PRIMARY ' if is_primary else ''}Image: {actual_name}]"
-                elif actual_type == 'application/pdf':
-                    description = f"[{'PRIMARY ' if is_primary else ''}PDF: {actual_name}]"
-                elif actual_type and actual_type.startswith('text/'):
-                    try:
-                        text_content = file_content.decode('utf-8')[:500]  # Limit for context
-                        description = f"[{'PRIMARY ' if is_primary else ''}Text file '{actual_name}': {text_content}...]"
-                    except:
-                        description = f"[{'PRIMARY ' if is_primary else ''}Text file: {actual_name}]"
-                else:
-                    description = f"[{'PRIMARY ' if is_primary else ''}File: {actual_name} ({actual_type})]"
-                
-                if is_primary:
-                    primary_file_description = description
-                    logger.info(f"🎯 Primary file identified: {actual_name}")
-                
-                file_descriptions.append(description)
+        # Header value for the attachments, built once the upload list is final
+        used_files_header = header_json([f["name"] for f in used_files]) if used_files else ""
         
         # Combine user content with file descriptions
         if file_descriptions:
-            combined_content = user_content + "\n\nAttached files:\n" + "\n".join(file_descriptions)
-            logger.info(f"📁 Combined content with {len(file_descriptions)} files")
+            combined_content = "".join((user_content, "\n\nAttached files:\n", "\n".join(file_descriptions)))
+            logger.info("📁 Combined content with %d files", len(file_descriptions))
         else:
             combined_content = user_content
         
         # Step 2: Generate LLM response
-        logger.info(f"🤖 Generating LLM response with model: {actual_model}")
+        logger.info("🤖 Generating LLM response with model: %s", actual_model)
         
         # Clear any conversation history that might contain XML examples
-        llm_service.clear_conversation_history()
+        if llm_service.has_history():
+            llm_service.clear_conversation_history()
         
         # NUCLEAR APPROACH: Use conversation examples to force clean responses
-        messages = [
-            {
-                "role": "system", 
-                "content": "You are Ava, a friendly AI assistant. You can analyze text, describe images, and work with various file types. Respond with natural conversational speech. If files are mentioned, acknowledge them and provide helpful responses about their content."
-            },
-            {
-                "role": "user",
-                "content": "Hi Ava"
-            },
-            {
-                "role": "assistant",
-                "content": "Hello! Nice to meet you!"
-            },
-            {
-                "role": "user", 
-                "content": combined_content  # Use the combined content with files
-            }
-        ]
+        messages = [*_VOICE_CHAT_PRIMER, {"role": "user", "content": combined_content}]
+        
+        if stream:
+            # Pipeline LLM -> TTS: synthesize each sentence while the rest is still generating
+            sentences = iter_sentences(llm_service.generate_response_stream(messages=messages, model=actual_model))
+            
+            logger.info("🌊 Streaming Voice Chat response with voice: %s", voice)
+            return StreamingResponse(
+                gpu_bound_stream(tts_service.generate_speech_stream(sentences, voice=voice)),
+                media_type="audio/wav",
+                headers={
+                    "X-Transcript": clean_for_header(stt_result["text"]),
+                    "X-LLM-Model": str(actual_model),
+                    "X-File-Count": str(len(used_files)),
+                    "Content-Disposition": "inline; filename=voice_response.wav",
+                    "Access-Control-Expose-Headers": _VOICE_CHAT_STREAM_EXPOSE_HEADERS
+                }
+            )
         
         llm_result = await llm_service.generate_response(
             messages=messages, 
@@ -693,97 +1041,37 @@ async def voice_chat_pipeline(
         # Filter out any XML/technical content that might have slipped through
         raw_response = llm_result["response"]
         
-        # LOG THE RAW RESPONSE TO SEE WHAT'S REALLY BEING GENERATED
-        logger.info(f"🔍 RAW LLM Response (first 500 chars): '{raw_response[:500]}'")
-        
-        filtered_response = raw_response
-        
-        # Remove common XML/HTML patterns AGGRESSIVELY
-        import re
-        xml_patterns = [
-            r'<\?xml[^>]*\?>',  # XML declarations like <?xml version="1.0" encoding="UTF-8"?>
-            r'<!DOCTYPE[^>]*>',  # DOCTYPE declarations
-            r'<[^>]+>',  # Any XML/HTML tags
-            r'www\.w3\.org[^\s]*',  # W3 URLs
-            r'xmlns[^\s]*',  # XML namespaces
-            r'encoding="[^"]*"',  # Encoding attributes
-            r'version="[^"]*"',  # Version attributes
-            r'XML version [0-9\.]+',  # Plain text XML version references
-            r'encoding [A-Za-z0-9-]+',  # Plain text encoding references
-        ]
-        
-        for pattern in xml_patterns:
-            filtered_response = re.sub(pattern, '', filtered_response, flags=re.IGNORECASE)
-        
-        # Clean up extra whitespace
-        filtered_response = re.sub(r'\s+', ' ', filtered_response.strip())
+        # Raw-output diagnostics are DEBUG only; %-args are never formatted at INFO
+        logger.debug("🔍 RAW LLM Response (first 500 chars): '%.500s'", raw_response)
         
-        # Light filtering: Only remove actual XML/HTML tags, preserve natural content
-        logger.info("🧹 Light filtering: Removing only XML tags, preserving natural content...")
-        
-        # Only remove actual XML content if present, but keep everything else
-        if any(marker in filtered_response.lower() for marker in ['<?xml', '<!doctype', '<html>', '</html>']):
-            logger.info("⚠️ Found XML content, applying stronger filtering")
-            # Keep the existing XML removal patterns but don't break natural content
-            pass
-        else:
-            logger.info("✅ No XML detected, keeping full response intact")
-        
-        # Use the filtered response (but only if we actually filtered XML content)
-        if any(marker in raw_response.lower() for marker in ['<?xml', '<!doctype', '<html>', '</html>']):
-            llm_result["response"] = filtered_response
+        # Only strip markup when the response actually contains XML/HTML; natural text stays intact
+        if _XML_DETECT_RE.search(raw_response):
+            filtered_response = _XML_FILTER_RE.sub('', raw_response)
+            llm_result["response"] = _WHITESPACE_RE.sub(' ', filtered_response).strip()
             logger.info("🧹 Applied XML filtering to response")
         else:
-            # Keep the original response intact for natural content
-            logger.info("✅ Keeping original response - no XML filtering needed")
+            logger.debug("✅ Keeping original response - no XML filtering needed")
         
-        logger.info(f"🤖 Voice Chat LLM response (filtered): '{llm_result['response'][:100]}...'")
+        logger.info("🤖 Voice Chat LLM response (filtered): '%.100s...'", llm_result['response'])
         
         # Step 3: Text to Speech
-        logger.info(f"🎤️ Generating TTS with voice: {voice}")
+        logger.info("🎤️ Generating TTS with voice: %s", voice)
         
-        # LOG WHAT GETS SENT TO TTS
         tts_text = llm_result["response"]
-        logger.info(f"🔍 Text being sent to TTS (first 200 chars): '{tts_text[:200]}'")
+        logger.debug("🔍 Text being sent to TTS (first 200 chars): '%.200s'", tts_text)
         
-        tts_audio = await tts_service.generate_speech(
+        tts_result = await tts_service.synthesize(
             text=tts_text,
             voice=voice
         )
         
         logger.info("✅ Voice Chat pipeline completed successfully")
         
-        # Return audio as streaming response with metadata in headers
-        # Clean encoding for HTTP headers (preserve common punctuation)
-        def clean_for_header(text: str, max_length: int = None) -> str:
-            """Clean text for HTTP headers while preserving punctuation"""
-            if not text:
-                return ""
-            
-            # Replace problematic characters but preserve common punctuation
-            text = text.replace('\r\n', ' ').replace('\n', ' ').replace('\r', ' ')
-            text = text.replace('\t', ' ')
-            
-            # Remove control characters but keep printable ASCII and common punctuation
-            cleaned = ''.join(char if 32 <= ord(char) <= 126 else ' ' for char in text)
-            # Ensure apostrophes are preserved
-            cleaned = cleaned.replace("'", "'").replace("'", "'")
-            
-            # Clean up multiple spaces
-            cleaned = ' '.join(cleaned.split())
-            
-            if max_length and len(cleaned) > max_length:
-                cleaned = cleaned[:max_length].rsplit(' ', 1)[0] + "..."
-            
-            return cleaned
-        
-        transcript_safe = clean_for_header(stt_result["text"])
-        llm_response_safe = clean_for_header(llm_result["response"], 200)
-        
-        # Include reasoning if available (truncated for header)
-        reasoning_safe = ""
-        if llm_result.get("reasoning"):
-            reasoning_safe = clean_for_header(llm_result["reasoning"], 300)
+        # Values used by both the metadata and the headers
+        stt_time = stt_result.get("processing_time", 0)
+        llm_time = llm_result.get("processing_time", 0)
+        tts_time = tts_result.processing_time
+        llm_tokens = llm_result.get("usage", {}).get("total_tokens", 0)
         
         # Create comprehensive metadata for the response
         response_metadata = {
@@ -792,78 +1080,128 @@ async def voice_chat_pipeline(
                 "language": stt_result.get("language", "unknown"),
                 "confidence": stt_result.get("confidence", 0),
                 "device_used": stt_result.get("device_used", "unknown"),
-                "processing_time": stt_result.get("processing_time", 0)
+                "processing_time": stt_time
             },
             "llm_response": {
                 "text": llm_result["response"],
-                "reasoning": llm_result.get("reasoning", ""),  # Full reasoning, no truncation!
+                "reasoning": llm_result.get("reasoning", ""),
                 "model": llm_result.get("model", model),
-                "tokens": llm_result.get("usage", {}).get("total_tokens", 0),
-                "processing_time": llm_result.get("processing_time", 0),
+                "tokens": llm_tokens,
+                "processing_time": llm_time,
                 "finish_reason": llm_result.get("finish_reason", "unknown")
             },
             "tts": {
-                "processing_time": await tts_service.get_last_processing_time(),
+                "processing_time": tts_time,
                 "voice": voice
             },
-            "total_processing_time": (
-                stt_result.get("processing_time", 0) + 
-                llm_result.get("processing_time", 0) + 
-                await tts_service.get_last_processing_time()
-            )
+            "total_processing_time": stt_time + llm_time + tts_time
         }
         
-        # Convert metadata to JSON string for header
-        import json
-        metadata_json = json.dumps(response_metadata, ensure_ascii=True)
-        
-        return StreamingResponse(
-            io.BytesIO(tts_audio),
-            media_type="audio/wav",
-            headers={
-                # Keep essential headers for backward compatibility
-                "X-Transcript": transcript_safe,
-                "X-LLM-Response": llm_response_safe,
-                "X-LLM-Reasoning": reasoning_safe,
-                "X-LLM-Model": str(llm_result.get("model", actual_model)),
-                "X-LLM-Tokens": str(llm_result.get("usage", {}).get("total_tokens", 0)),
-                "X-LLM-Processing-Time": str(llm_result.get("processing_time", 0)),
-                "X-TTS-Processing-Time": str(await tts_service.get_last_processing_time()),
-                "X-Used-Files": json.dumps([f["name"] for f in used_files]) if used_files else "",
-                "X-Primary-File": primary_file_description or "",
-                "X-File-Count": str(len(used_files)),
-                # NEW: Full metadata in JSON format
-                "X-Voice-Bridge-Data": metadata_json,
-                "Content-Disposition": "inline; filename=voice_response.wav",
-                # CORS headers to allow frontend to access our custom headers
-                "Access-Control-Expose-Headers": "X-Transcript,X-LLM-Response,X-LLM-Reasoning,X-LLM-Model,X-LLM-Tokens,X-LLM-Processing-Time,X-TTS-Processing-Time,X-Used-Files,X-Primary-File,X-File-Count,X-Voice-Bridge-Data"
+        if metadata_in_body:
+            # Metadata travels as the first part, so nothing needs header cleaning
+            response_metadata["files"] = {
+                "used": used_files,
+                "primary": primary_file_description
             }
-        )
+            boundary = uuid.uuid4().hex
+            return StreamingResponse(
+                iter_multipart_audio(orjson.dumps(response_metadata), tts_result.audio, boundary),
+                media_type=f"multipart/mixed; boundary={boundary}"
+            )
+        
+        # Headers only get a reasoning preview; the full text is fetched from /api/v1/last-reasoning
+        reasoning = response_metadata["llm_response"]["reasoning"]
+        if reasoning and len(reasoning) > _REASONING_PREVIEW_CHARS:
+            reasoning_id = uuid.uuid4().hex
+            _reasoning_store[reasoning_id] = reasoning
+            while len(_reasoning_store) > _REASONING_STORE_SIZE:
+                _reasoning_store.popitem(last=False)
+            response_metadata["llm_response"].update(
+                reasoning=reasoning[:_REASONING_PREVIEW_CHARS],
+                reasoning_truncated=True,
+                reasoning_id=reasoning_id
+            )
+        
+        # Return audio with metadata in headers
+        transcript_safe = clean_for_header(stt_result["text"])
+        llm_response_safe = clean_for_header(llm_result["response"], 200)
+        
+        # Include reasoning if available (truncated for header)
+        reasoning_safe = ""
+        if llm_result.get("reasoning"):
+            reasoning_safe = clean_for_header(llm_result["reasoning"], 300)
+        
+        # Convert metadata to JSON string for header
+        metadata_json = header_json(response_metadata)
+        content, media_type, extension = await negotiate_audio(http_request, tts_result.audio)
+        
+        headers = _VOICE_CHAT_HEADERS.copy()
+        # Keep essential headers for backward compatibility
+        headers["X-Transcript"] = transcript_safe
+        headers["X-LLM-Response"] = llm_response_safe
+        headers["X-LLM-Reasoning"] = reasoning_safe
+        headers["X-LLM-Model"] = str(llm_result.get("model", actual_model))
+        headers["X-LLM-Tokens"] = "%d" % llm_tokens
+        headers["X-LLM-Processing-Time"] = f"{llm_time:.3f}"
+        headers["X-TTS-Processing-Time"] = f"{tts_time:.3f}"
+        headers["X-Used-Files"] = used_files_header
+        headers["X-Primary-File"] = clean_for_header(primary_file_description, 500)
+        headers["X-File-Count"] = str(len(used_files))
+        # Full metadata in JSON format
+        headers["X-Voice-Bridge-Data"] = metadata_json
+        if extension != "wav":
+            headers["Content-Disposition"] = f"inline; filename=voice_response.{extension}"
+        
+        return Response(content=content, media_type=media_type, headers=headers)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Voice chat pipeline error: {e}")
         raise HTTPException(status_code=500, detail=f"Voice chat failed: {str(e)}")
 
 
-@app.post("/api/v1/vibevoice-conversation")
-async def vibevoice_conversation(request: VibeVoiceConversationRequest):
+@app.get("/api/v1/last-reasoning/{reasoning_id}")
+async def get_last_reasoning(reasoning_id: str):
+    """Full reasoning for a voice-chat reply whose header metadata was truncated"""
+    reasoning = _reasoning_store.get(reasoning_id)
+    if reasoning is None:
+        raise HTTPException(status_code=404, detail="Reasoning not found or expired")
+    return {"reasoning_id": reasoning_id, "reasoning": reasoning}
+
+
+@app.post("/api/v1/vibevoice-conversation", openapi_extra=json_body_openapi(VibeVoiceConversationRequest))
+@gpu_bound
+async def vibevoice_conversation(
+    request: VibeVoiceConversationRequest = Depends(json_body(VibeVoiceConversationRequest)),
+    vibevoice: VibeVoiceService = Depends(get_vibevoice_service)
+):
     """Create multi-speaker conversations using VibeVoice"""
     try:
-        if not tts_service.vibevoice_service:
-            raise HTTPException(status_code=503, detail="VibeVoice service not available")
-        
         logger.info(f"🎭 Creating VibeVoice conversation with {len(request.speaker_voices)} speakers")
         
-        # Create the conversation using VibeVoice
-        audio_data = await tts_service.vibevoice_service.create_conversation(
+        if request.output_format == "wav":
+            # Stream segment by segment so playback starts after the first speaker's line
+            audio_stream = vibevoice.stream_conversation(
+                script=request.script,
+                speaker_voices=request.speaker_voices
+            )
+            return StreamingResponse(
+                gpu_bound_stream(audio_stream),
+                media_type="audio/wav",
+                headers={"Content-Disposition": "inline; filename=conversation.wav"}
+            )
+        
+        # Other formats need the whole conversation before encoding
+        audio_data = await vibevoice.create_conversation(
             script=request.script,
             speaker_voices=request.speaker_voices,
             output_format=request.output_format
         )
         
-        # Return audio as streaming response
-        return StreamingResponse(
-            io.BytesIO(audio_data),
+        # Return the complete audio in one response
+        return Response(
+            content=audio_data,
             media_type=f"audio/{request.output_format}",
             headers={"Content-Disposition": f"inline; filename=conversation.{request.output_format}"}
         )
@@ -873,14 +1211,29 @@ async def vibevoice_conversation(request: VibeVoiceConversationRequest):
         raise HTTPException(status_code=500, detail=f"VibeVoice conversation failed: {str(e)}")
 
 
+async def _get_cached_vibevoice_voices(service: VibeVoiceService) -> Dict:
+    """Return VibeVoice voices, rebuilding only when the voice directory changes"""
+    global _voices_cache
+    
+    try:
+        mtime = service.temp_dir.stat().st_mtime
+    except OSError:
+        mtime = 0.0
+    count = len(service.voice_configs)
+    
+    if _voices_cache is not None and _voices_cache[:2] == (mtime, count):
+        return _voices_cache[2]
+    
+    voices = await service.get_available_voices()
+    _voices_cache = (mtime, count, voices)
+    return voices
+
+
 @app.get("/api/v1/vibevoice-voices")
-async def get_vibevoice_voices():
+async def get_vibevoice_voices(vibevoice: VibeVoiceService = Depends(get_vibevoice_service)):
     """Get available VibeVoice voices"""
     try:
-        if not tts_service.vibevoice_service:
-            raise HTTPException(status_code=503, detail="VibeVoice service not available")
-        
-        voices = await tts_service.vibevoice_service.get_available_voices()
+        voices = await _get_cached_vibevoice_voices(vibevoice)
         
         return {
             "status": "success",
@@ -919,73 +1272,74 @@ async def create_voice_clone(
     name: str = Form(..., description="Voice clone name"),
     transcript: str = Form(..., description="Transcript for the voice sample"),
     audio: UploadFile = File(..., description="Voice sample audio file"),
-    description: str = Form(None, description="Optional description of the voice")
+    description: str = Form(None, description="Optional description of the voice"),
+    vibevoice: VibeVoiceService = Depends(get_vibevoice_service)
 ):
     """Create a new voice clone from uploaded audio and transcript"""
     try:
-        logger.info(f"🎤 Voice clone request: name='{name}', filename='{audio.filename}', content_type='{audio.content_type}', size={audio.size if hasattr(audio, 'size') else 'unknown'}")
-        
-        if not tts_service or not tts_service.vibevoice_service:
-            logger.error("VibeVoice service not available")
-            raise HTTPException(status_code=503, detail="VibeVoice service not available")
+        logger.info(
+            "🎤 Voice clone request: name='%s', filename='%s', content_type='%s', size=%s",
+            name, audio.filename, audio.content_type, getattr(audio, 'size', 'unknown')
+        )
         
         # Detailed audio file validation with logging
-        logger.info(f"🔍 Validating audio file: {audio.filename} ({audio.content_type})")
+        logger.info("🔍 Validating audio file: %s (%s)", audio.filename, audio.content_type)
         if not validate_audio_file(audio):
             logger.error(f"❌ Audio validation failed for: {audio.filename} ({audio.content_type})")
             raise HTTPException(status_code=400, detail="Invalid audio file format")
         
         logger.info("✅ Audio validation passed")
         
-        # Read audio data
-        audio_data = await audio.read()
-        logger.info(f"📁 Read {len(audio_data)} bytes of audio data")
+        # Hand the spooled upload file straight to the service instead of copying it into bytes
+        await audio.seek(0)
+        logger.info("📁 Received %s bytes of audio data", getattr(audio, 'size', 'unknown'))
         
-        # Try to get audio info for debugging
-        try:
-            from utils.audio_utils import get_audio_info
-            audio_info = get_audio_info(audio_data)
-            logger.info(f"🎵 Audio info: {audio_info}")
-        except Exception as info_error:
-            logger.warning(f"Could not get audio info: {info_error}")
+        # Decoding the sample twice is only worth it when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            try:
+                from utils.audio_utils import get_audio_info
+                audio_info = await asyncio.to_thread(get_audio_info, await audio.read())
+                logger.debug("🎵 Audio info: %s", audio_info)
+            except Exception as info_error:
+                logger.warning(f"Could not get audio info: {info_error}")
+            finally:
+                # The service reads audio.file from the start
+                await audio.seek(0)
         
-        logger.info(f"🎤 Creating voice clone '{name}' with transcript: '{transcript[:50]}...'")
+        logger.info("🎤 Creating voice clone '%s' with transcript: '%.50s...'", name, transcript)
         
         # Create voice clone using VibeVoice service
-        result = await tts_service.vibevoice_service.create_voice_clone(
+        result = await vibevoice.create_voice_clone(
             name=name,
             transcript=transcript,
-            audio_data=audio_data,
+            audio_data=audio.file,
             description=description
         )
         
-        logger.info(f"✅ Voice clone created successfully: {result}")
+        logger.info("✅ Voice clone created successfully: %s", result)
         return VoiceCloneResponse(**result)
         
     except HTTPException:
         raise  # Re-raise HTTP exceptions as-is
     except Exception as e:
-        logger.error(f"❌ Voice clone creation error: {type(e).__name__}: {e}")
-        import traceback
-        logger.error(f"❌ Full traceback: {traceback.format_exc()}")
+        # exc_info defers traceback formatting to the handler
+        logger.error("❌ Voice clone creation error: %s: %s", type(e).__name__, e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Voice clone creation failed: {str(e)}")
 
 
 @app.post("/api/v1/voice-clone/test")
 async def test_voice_clone(
     voice_id: str = Form(..., description="Voice clone ID to test"),
-    text: str = Form(..., description="Text to synthesize with the cloned voice")
+    text: str = Form(..., description="Text to synthesize with the cloned voice"),
+    vibevoice: VibeVoiceService = Depends(get_vibevoice_service)
 ):
     """Test a voice clone by generating speech"""
     try:
-        if not tts_service or not tts_service.vibevoice_service:
-            raise HTTPException(status_code=503, detail="VibeVoice service not available")
-        
-        logger.info(f"🎤 Testing voice clone '{voice_id}' with text: '{text[:50]}...'")
+        logger.info("🎤 Testing voice clone '%s' with text: '%.50s...'", voice_id, text)
         
         # Test voice clone using VibeVoice service
         try:
-            audio_data = await tts_service.vibevoice_service.test_voice_clone(
+            audio_data = await vibevoice.test_voice_clone(
                 voice_id=voice_id,
                 text=text
             )
@@ -993,15 +1347,15 @@ async def test_voice_clone(
             # Fallback: if clone not found, try to reconcile with available clones
             if "not found" in str(e).lower():
                 try:
-                    clones = await tts_service.vibevoice_service.get_voice_clones()
+                    clones = await vibevoice.get_voice_clones()
                     candidate_id = None
                     if clones:
                         ids = [c.get("voice_id") for c in clones]
                         if voice_id not in ids and len(clones) == 1:
                             candidate_id = clones[0].get("voice_id")
                     if candidate_id:
-                        logger.warning(f"Voice clone '{voice_id}' not found. Retrying with available voice clone '{candidate_id}'.")
-                        audio_data = await tts_service.vibevoice_service.test_voice_clone(
+                        logger.warning("Voice clone '%s' not found. Retrying with available voice clone '%s'.", voice_id, candidate_id)
+                        audio_data = await vibevoice.test_voice_clone(
                             voice_id=candidate_id,
                             text=text
                         )
@@ -1012,17 +1366,12 @@ async def test_voice_clone(
             else:
                 raise
         
-        # Return audio as streaming response
-        return StreamingResponse(
-            io.BytesIO(audio_data),
-            media_type="audio/wav",
-            headers={
-                "Content-Disposition": f"inline; filename=voice_clone_{voice_id}_test.wav",
-                "X-Voice-Clone-ID": voice_id,
-                "X-Test-Text": text[:100],  # Truncate for header
-                "Access-Control-Expose-Headers": "X-Voice-Clone-ID,X-Test-Text"
-            }
-        )
+        # Return the complete audio in one response
+        headers = _VOICE_CLONE_TEST_HEADERS.copy()
+        headers["Content-Disposition"] = f"inline; filename=voice_clone_{voice_id}_test.wav"
+        headers["X-Voice-Clone-ID"] = voice_id
+        headers["X-Test-Text"] = clean_for_header(text, 100)
+        return Response(content=audio_data, media_type="audio/wav", headers=headers)
         
     except Exception as e:
         logger.error(f"Voice clone test error: {e}")
@@ -1030,18 +1379,15 @@ async def test_voice_clone(
 
 
 @app.get("/api/v1/voice-clones", response_model=VoiceCloneListResponse)
-async def list_voice_clones():
+async def list_voice_clones(vibevoice: VibeVoiceService = Depends(get_vibevoice_service)):
     """Get list of available voice clones with cached test audio information"""
     try:
-        if not tts_service or not tts_service.vibevoice_service:
-            raise HTTPException(status_code=503, detail="VibeVoice service not available")
-        
-        voice_clones = await tts_service.vibevoice_service.get_voice_clones()
+        voice_clones = await vibevoice.get_voice_clones()
         
         # Add cached test audio information to each voice clone
         for clone in voice_clones:
             voice_id = clone.get("voice_id")
-            cached_info = tts_service.vibevoice_service.get_cached_test_audio_info(voice_id)
+            cached_info = vibevoice.get_cached_test_audio_info(voice_id)
             clone["cached_test_audio"] = cached_info
         
         return VoiceCloneListResponse(
@@ -1057,20 +1403,18 @@ async def list_voice_clones():
 
 @app.get("/api/v1/voice-clone/{voice_id}/cached-audio")
 async def get_cached_test_audio(
-    voice_id: str
+    voice_id: str,
+    vibevoice: VibeVoiceService = Depends(get_vibevoice_service)
 ):
     """Retrieve cached test audio for a voice clone"""
     try:
-        if not tts_service or not tts_service.vibevoice_service:
-            raise HTTPException(status_code=503, detail="VibeVoice service not available")
-        
         # Get cached audio info
-        cached_info = tts_service.vibevoice_service.get_cached_test_audio_info(voice_id)
+        cached_info = vibevoice.get_cached_test_audio_info(voice_id)
         if not cached_info:
             raise HTTPException(status_code=404, detail="No cached test audio found for this voice clone")
         
         # Get the actual cached audio
-        cached_audio = tts_service.vibevoice_service._get_cached_test_audio(
+        cached_audio = vibevoice._get_cached_test_audio(
             voice_id, 
             cached_info['text']
         )
@@ -1078,19 +1422,19 @@ async def get_cached_test_audio(
         if not cached_audio:
             raise HTTPException(status_code=404, detail="Cached audio file not found")
         
-        logger.info(f"📋 Serving cached test audio for '{voice_id}': {len(cached_audio)} bytes")
+        logger.info("📋 Serving cached test audio for '%s': %d bytes", voice_id, len(cached_audio))
         
         # Return cached audio as streaming response
-        return StreamingResponse(
-            io.BytesIO(cached_audio),
+        return Response(
+            content=cached_audio,
             media_type="audio/wav",
             headers={
                 "Content-Disposition": f"inline; filename=voice_clone_{voice_id}_cached_test.wav",
                 "X-Voice-Clone-ID": voice_id,
-                "X-Test-Text": cached_info['text'][:100],
+                "X-Test-Text": clean_for_header(cached_info['text'], 100),
                 "X-Cached-Audio": "true",
                 "X-Cache-Timestamp": str(cached_info.get('tested_at', '')),
-                "Access-Control-Expose-Headers": "X-Voice-Clone-ID,X-Test-Text,X-Cached-Audio,X-Cache-Timestamp"
+                "Access-Control-Expose-Headers": _VOICE_CLONE_CACHED_EXPOSE_HEADERS
             }
         )
         
@@ -1119,10 +1463,9 @@ async def create_dynamic_conversation(
             raise HTTPException(status_code=503, detail="ConversationEngine service not available")
         
         # Parse speaker mapping JSON
-        import json
         try:
-            speaker_map = json.loads(speaker_mapping)
-        except json.JSONDecodeError as e:
+            speaker_map = orjson.loads(speaker_mapping)
+        except orjson.JSONDecodeError as e:
             raise HTTPException(status_code=400, detail=f"Invalid speaker_mapping JSON: {e}")
         
         # Convert style string to enum
@@ -1151,9 +1494,9 @@ async def create_dynamic_conversation(
         # Convert emotion distribution to JSON-serializable format
         emotion_dist_json = {emotion.value: score for emotion, score in metadata.emotion_distribution.items()}
         
-        # Return audio as streaming response with detailed metadata
-        return StreamingResponse(
-            io.BytesIO(audio_data),
+        # Return audio with detailed metadata
+        return Response(
+            content=audio_data,
             media_type="audio/wav",
             headers={
                 "Content-Disposition": "attachment; filename=dynamic_conversation.wav",
@@ -1161,7 +1504,7 @@ async def create_dynamic_conversation(
                 "X-Speaker-Count": str(metadata.speaker_count),
                 "X-Word-Count": str(metadata.word_count),
                 "X-Interaction-Complexity": str(metadata.interaction_complexity),
-                "X-Emotion-Distribution": json.dumps(emotion_dist_json),
+                "X-Emotion-Distribution": header_json(emotion_dist_json),
                 "X-Conversation-Style": style.value,
                 "Access-Control-Expose-Headers": "X-Conversation-Duration,X-Speaker-Count,X-Word-Count,X-Interaction-Complexity,X-Emotion-Distribution,X-Conversation-Style"
             }
@@ -1170,9 +1513,7 @@ async def create_dynamic_conversation(
     except HTTPException:
         raise  # Re-raise HTTP exceptions as-is
     except Exception as e:
-        logger.error(f"❌ Dynamic conversation creation failed: {type(e).__name__}: {e}")
-        import traceback
-        logger.error(f"Full traceback: {traceback.format_exc()}")
+        logger.error("❌ Dynamic conversation creation failed: %s: %s", type(e).__name__, e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Dynamic conversation creation failed: {str(e)}")
 
 @app.get("/api/v1/conversation/styles")
@@ -1242,7 +1583,7 @@ async def get_conversation_analytics():
         return {
             "status": "success",
             "analytics": analytics,
-            "timestamp": asyncio.get_event_loop().time()
+            "timestamp": time.monotonic()
         }
         
     except HTTPException:
@@ -1263,7 +1604,7 @@ async def clear_conversation_history():
         return {
             "status": "success",
             "message": "Conversation history cleared successfully",
-            "timestamp": asyncio.get_event_loop().time()
+            "timestamp": time.monotonic()
         }
         
     except HTTPException:
@@ -1279,21 +1620,27 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         await websocket_manager.connect(websocket)
         logger.info(f"WebSocket client connected: {websocket.client}")
+        audio_seq = 0
         
         while True:
-            # Receive message from client
-            data = await websocket.receive_json()
+            # Receive message from client; audio arrives as binary frames, control messages as JSON
+            try:
+                data = await websocket_manager.receive_frame(websocket)
+            except ValueError as e:
+                await websocket_manager.send_json(websocket, {"type": "error", "message": f"Invalid message: {e}"})
+                continue
+            if isinstance(data, bytes):
+                audio_chunk, data = data, {"type": "audio_chunk"}
+            else:
+                audio_chunk = data.get("audio_data")
             
             # Handle different message types
             if data.get("type") == "audio_chunk":
-                # Process real-time audio chunk
-                audio_chunk = data.get("audio_data")
-                
-                # Stream STT results
+                # Stream STT results for the real-time audio chunk
                 if audio_chunk:
                     stt_result = await stt_service.stream_transcribe(audio_chunk)
                     if stt_result:
-                        await websocket.send_json({
+                        await websocket_manager.send_json(websocket, {
                             "type": "transcription",
                             "text": stt_result["text"],
                             "confidence": stt_result.get("confidence", 0)
@@ -1308,36 +1655,145 @@ async def websocket_endpoint(websocket: WebSocket):
                 llm_response = await llm_service.generate_response(messages=messages)
                 
                 # Send text response
-                await websocket.send_json({
+                await websocket_manager.send_json(websocket, {
                     "type": "llm_response",
                     "text": llm_response["response"]
                 })
                 
-                # Generate and send audio response
+                # Generate and send audio response as binary frames
                 audio_data = await tts_service.generate_speech(
-                    text=llm_response["response"]
+                    text=llm_response["response"],
+                    voice=tts_service.default_voice
                 )
                 
-                await websocket.send_json({
-                    "type": "audio_response",
-                    "audio_data": audio_data
-                })
+                audio_seq += 1
+                await websocket_manager.send_audio(websocket, audio_data, seq=audio_seq)
             
             elif data.get("type") == "ping":
                 # Heartbeat
-                await websocket.send_json({"type": "pong"})
+                await websocket_manager.send_pong(websocket)
                 
     except WebSocketDisconnect:
         logger.info(f"WebSocket client disconnected: {websocket.client}")
         websocket_manager.disconnect(websocket)
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
-        await websocket.send_json({
+        await websocket_manager.send_json(websocket, {
             "type": "error",
             "message": str(e)
         })
 
 
+@app.websocket("/ws/voice-chat")
+async def voice_chat_websocket(websocket: WebSocket):
+    """Full-duplex voice chat: one connection per conversation instead of one HTTP request per turn
+    
+    Protocol:
+        binary frames            -> audio bytes of the current utterance (any Whisper-readable format)
+        {"type": "config"}       -> optional voice / model / language for the following turns
+        {"type": "end_of_utterance"} -> transcribe the buffered audio and answer it
+        {"type": "text_message", "text": ...} -> answer text directly
+        {"type": "ping"}         -> {"type": "pong"}
+    
+    Each answer is sent as {"type": "audio_stream_start"}, a WAV header and PCM
+    binary frames synthesized sentence by sentence, then {"type": "audio_stream_end"}.
+    """
+    await websocket_manager.connect(websocket)
+    voice = tts_service.default_voice
+    model = "default"
+    language = "auto"
+    # Only the last 10 turns are sent to the LLM, so older ones are not kept
+    history: Deque[Dict[str, str]] = deque(maxlen=10)
+    utterance = bytearray()
+    utterance_rejected = False
+    audio_seq = 0
+    
+    async def answer(user_text: str) -> None:
+        nonlocal audio_seq
+        audio_seq += 1
+        # Primer first, then this connection's turns, so consecutive prompts share a growing prefix
+        messages = [*_VOICE_CHAT_PRIMER, *history, {"role": "user", "content": user_text}]
+        spoken: List[str] = []
+        
+        async def sentences():
+            async for sentence in iter_sentences(llm_service.generate_response_stream(messages=messages, model=model)):
+                spoken.append(sentence)
+                yield sentence
+        
+        await websocket_manager.send_json(websocket, {"type": "audio_stream_start", "seq": audio_seq, "format": "wav"})
+        async for chunk in gpu_bound_stream(tts_service.generate_speech_stream(sentences(), voice=voice)):
+            await websocket.send_bytes(chunk)
+        
+        response_text = " ".join(spoken)
+        history.extend(({"role": "user", "content": user_text}, {"role": "assistant", "content": response_text}))
+        await websocket_manager.send_json(websocket, {"type": "audio_stream_end", "seq": audio_seq, "text": response_text})
+    
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            
+            if message.get("bytes") is not None:
+                if utterance_rejected:
+                    continue
+                if len(utterance) + len(message["bytes"]) > MAX_AUDIO_SIZE:
+                    # Drop the rest of this utterance; the next end_of_utterance starts a fresh one
+                    utterance, utterance_rejected = bytearray(), True
+                    await websocket_manager.send_json(websocket, {
+                        "type": "error",
+                        "message": f"Utterance exceeds {MAX_AUDIO_SIZE} bytes"
+                    })
+                    continue
+                utterance += message["bytes"]
+                continue
+            
+            try:
+                data = orjson.loads(message.get("text") or "{}")
+                if not isinstance(data, dict):
+                    raise ValueError("Expected a JSON object")
+                message_type = data.get("type")
+                
+                if message_type == "config":
+                    voice = data.get("voice", voice)
+                    model = data.get("model", model)
+                    language = data.get("language", language)
+                
+                elif message_type == "end_of_utterance":
+                    utterance_rejected = False
+                    if not utterance:
+                        continue
+                    audio_data, utterance = bytes(utterance), bytearray()
+                    stt_result = await stt_service.transcribe(audio_data, language=language)
+                    await websocket_manager.send_json(websocket, {
+                        "type": "transcription",
+                        "text": stt_result["text"],
+                        "language": stt_result.get("language", "unknown")
+                    })
+                    if stt_result["text"].strip():
+                        await answer(stt_result["text"])
+                
+                elif message_type == "text_message" and data.get("text"):
+                    await answer(data["text"])
+                
+                elif message_type == "ping":
+                    await websocket_manager.send_pong(websocket)
+            
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                # A failed turn is reported; the conversation stays open
+                logger.error(f"Voice chat WebSocket turn failed: {e}")
+                await websocket_manager.send_json(websocket, {"type": "error", "message": str(e)})
+    
+    except WebSocketDisconnect:
+        logger.info(f"Voice chat WebSocket disconnected: {websocket.client}")
+    except Exception as e:
+        logger.error(f"Voice chat WebSocket error: {e}")
+    finally:
+        websocket_manager.disconnect(websocket)
+
+
 # Voice sample endpoints
 from voice_sample_generator import voice_sample_generator
 
@@ -1380,10 +1836,8 @@ async def generate_voice_sample(
 ):
     """Generate a voice sample for a specific voice library entry"""
     try:
-        import json
-        
         # Parse voice config
-        config = json.loads(voice_config) if voice_config else {}
+        config = orjson.loads(voice_config) if voice_config else {}
         config.update({
             'id': voice_id,
             'name': voice_name,
@@ -1443,12 +1897,12 @@ async def generate_library_samples(
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Custom HTTP exception handler"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
             "status_code": exc.status_code,
-            "timestamp": asyncio.get_event_loop().time()
+            "timestamp": time.monotonic()
         }
     )
 
@@ -1457,21 +1911,35 @@ async def http_exception_handler(request, exc):
 async def general_exception_handler(request, exc):
     """General exception handler"""
     logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
             "status_code": 500,
-            "timestamp": asyncio.get_event_loop().time()
+            "timestamp": time.monotonic()
         }
     )
 
 
 if __name__ == "__main__":
+    web_workers = settings.web_workers
+    if web_workers > 1 and settings.gpu_acceleration_enabled:
+        # _gpu_semaphore and _reasoning_store live in each process, so extra workers would
+        # oversubscribe the GPU and 404 reasoning follow-ups that land on another worker
+        logger.warning("⚠️ WEB_CONCURRENCY=%d ignored: GPU services need a single worker", web_workers)
+        web_workers = 1
+    if web_workers > 1 and settings.reload:
+        logger.warning("⚠️ WEB_CONCURRENCY=%d ignored: uvicorn runs one process while RELOAD is on", web_workers)
+    
+    # C event loop and HTTP parser when installed (uvloop has no Windows build)
     uvicorn.run(
         "main:app",
         host=settings.backend_host,
         port=settings.backend_port,
         reload=settings.reload,
-        log_level=settings.log_level.lower()
+        workers=web_workers,
+        log_level=settings.log_level.lower(),
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        ws="websockets"
     )
\ No newline at end of file
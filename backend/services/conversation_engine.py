@@ -15,6 +15,8 @@ from enum import Enum
 import numpy as np
 from pathlib import Path
 
+from utils.audio_utils import concat_audio_segments
+
 logger = logging.getLogger(__name__)
 
 
@@ -886,8 +888,8 @@ class ConversationEngine:
             if not segments:
                 raise ValueError("No valid audio segments")
                 
-            # Concatenate all segments
-            final_audio = sum(segments)
+            # Concatenate all segments in a single pass
+            final_audio = concat_audio_segments(segments)
             
             # Apply conversation-style processing
             if conversation_style == ConversationStyle.PODCAST:
@@ -6,9 +6,10 @@ Connects to LM Studio for ByteDance OSS36B model processing
 import asyncio
 import logging
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence
 import aiohttp
 import json
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,9 @@ class LLMService:
         self.default_model = "bytedance/seed-oss-36b"
         self.session: Optional[aiohttp.ClientSession] = None
         self.conversation_history: List[Dict[str, str]] = []
+        # Models recently confirmed loaded in LM Studio (model -> timestamp)
+        self._warmed_models: Dict[str, float] = {}
+        self.prewarm_ttl = 300  # seconds
         
     async def initialize(self) -> None:
         """Initialize the LLM service"""
@@ -80,6 +84,39 @@ class LLMService:
         except Exception:
             return False
     
+    async def prewarm(self, model: Optional[str] = None, messages: Optional[Sequence[Dict[str, str]]] = None) -> None:
+        """Make sure a model is loaded in LM Studio before the real prompt arrives
+        
+        Passing a fixed prompt prefix as ``messages`` also leaves it in LM Studio's
+        prompt cache, so the first real request only prefills what follows it.
+        """
+        if not self.session:
+            return
+        
+        model_name = model if model and model != "default" else self.default_model
+        now = time.time()
+        if now - self._warmed_models.get(model_name, 0) < self.prewarm_ttl:
+            return
+        
+        try:
+            payload = {
+                "model": model_name,
+                "messages": messages or [{"role": "user", "content": "hi"}],
+                "temperature": 0.0,
+                "max_tokens": 1
+            }
+            async with self.session.post(
+                f"{self.base_url}/chat/completions",
+                data=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"}
+            ) as response:
+                await response.read()
+                if response.status == 200:
+                    self._warmed_models[model_name] = now
+                    logger.info(f"🔥 Prewarmed {model_name} in {time.time() - now:.2f}s")
+        except Exception as e:
+            logger.warning(f"⚠️ LLM prewarm failed for {model_name}: {e}")
+    
     async def generate_response(
         self,
         messages: List[Dict[str, str]],
@@ -122,7 +159,8 @@ class LLMService:
             # Add current messages
             conversation.extend(messages)
             
-            # Prepare request payload
+            # Prepare request payload; orjson keeps insertion order, so a repeated
+            # prompt prefix serializes to identical bytes for LM Studio's prompt cache
             payload = {
                 "model": model_name,
                 "messages": conversation,
@@ -137,7 +175,7 @@ class LLMService:
             # Make request to LM Studio
             async with self.session.post(
                 f"{self.base_url}/chat/completions",
-                json=payload,
+                data=orjson.dumps(payload),
                 headers={"Content-Type": "application/json"}
             ) as response:
                 
@@ -231,7 +269,7 @@ class LLMService:
             
             async with self.session.post(
                 f"{self.base_url}/chat/completions",
-                json=payload,
+                data=orjson.dumps(payload),
                 headers={"Content-Type": "application/json"}
             ) as response:
                 
@@ -284,6 +322,34 @@ class LLMService:
                 "error": str(e)
             }
     
+    async def generate_response_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ):
+        """
+        Stream LLM response text deltas (async generator)
+
+        Yields:
+            Content strings as they arrive; raises on streaming errors
+        """
+        async for chunk in self.generate_streaming_response(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens
+        ):
+            if chunk["type"] == "chunk":
+                yield chunk["content"]
+            elif chunk["type"] == "error":
+                raise Exception(f"LLM streaming failed: {chunk['error']}")
+
+    def has_history(self) -> bool:
+        """Whether any conversation turns are stored"""
+        return bool(self.conversation_history)
+    
     def clear_conversation_history(self) -> None:
         """Clear conversation history"""
         self.conversation_history.clear()
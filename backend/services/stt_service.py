@@ -7,9 +7,11 @@ import asyncio
 import io
 import logging
 import tempfile
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional, Union
 
 import torch
 import whisper
@@ -18,10 +20,16 @@ from pydub import AudioSegment
 import librosa
 
 from app.config import Settings
+from utils.audio_pool import stt_buffer_pool, upload_buffer_pool, WHISPER_SAMPLE_RATE
+from utils.audio_utils import decode_to_pcm16, sniff_audio_header, AUDIO_HEADER_SIZE
 
 logger = logging.getLogger(__name__)
 settings = Settings()
 
+# The mmap loader relies on openai-whisper internals (_download, _MODELS, _ALIGNMENT_HEADS and
+# the non-persistent buffers); it is only used with the release it was written against
+MMAP_WHISPER_VERSION = "20231117"
+
 
 class STTService:
     """High-performance Speech-to-Text service with GPU acceleration"""
@@ -33,6 +41,11 @@ class STTService:
         self.language = settings.whisper_language
         self.sample_rate = settings.audio_sample_rate
         self.processing_times = []
+        # Decoding runs in worker processes; Whisper runs in a thread, one call at a time
+        self.cpu_pool: Optional[ProcessPoolExecutor] = None
+        self._model_lock = threading.Lock()
+        # Dedicated CUDA stream so Whisper kernels can overlap with VibeVoice on the default stream
+        self.cuda_stream: Optional[torch.cuda.Stream] = None
         
     async def initialize(self):
         """Initialize Whisper model with GPU support"""
@@ -49,16 +62,19 @@ class STTService:
             
             # Load Whisper model
             logger.info(f"📥 Loading Whisper model: {self.model_name}")
-            self.model = whisper.load_model(
-                self.model_name, 
-                device=self.device,
-                download_root=Path("models/whisper")
-            )
+            if settings.cpu_workers > 0:
+                self.cpu_pool = ProcessPoolExecutor(max_workers=settings.cpu_workers)
+            
+            # Run the blocking load off the event loop so other services can start in parallel
+            self.model = await asyncio.to_thread(self._load_whisper_model)
             
             # Optimize for GPU if available
             if self.device == "cuda":
                 self.model.half()  # Use FP16 for faster inference
                 torch.cuda.empty_cache()
+                self.cuda_stream = torch.cuda.Stream()
+                # Weights were copied on the default stream; order our stream after them
+                self.cuda_stream.wait_stream(torch.cuda.current_stream())
             
             logger.info(f"✅ Whisper {self.model_name} model loaded on {self.device}")
             
@@ -66,6 +82,51 @@ class STTService:
             logger.error(f"❌ Failed to initialize STT service: {e}")
             raise
     
+    def _load_whisper_model(self):
+        """Load Whisper weights via mmap onto a meta-initialized model, falling back to whisper.load_model"""
+        download_root = Path("models/whisper")
+        if getattr(whisper, "__version__", None) != MMAP_WHISPER_VERSION:
+            logger.info(f"ℹ️ openai-whisper {getattr(whisper, '__version__', 'unknown')} is not {MMAP_WHISPER_VERSION}, using standard loader")
+            return whisper.load_model(self.model_name, device=self.device, download_root=download_root, in_memory=False)
+        
+        try:
+            from whisper.model import ModelDimensions, Whisper
+            
+            checkpoint_file = whisper._download(whisper._MODELS[self.model_name], str(download_root), False)
+            checkpoint = torch.load(checkpoint_file, map_location="cpu", mmap=True, weights_only=True)
+            dims = ModelDimensions(**checkpoint["dims"])
+            
+            # Build on the meta device and assign the mmap'd tensors directly (no CPU staging copy)
+            with torch.device("meta"):
+                model = Whisper(dims)
+            model.load_state_dict(checkpoint["model_state_dict"], assign=True)
+            
+            # Non-persistent buffers are not in the checkpoint, rebuild them for real
+            model.decoder.mask = torch.empty(dims.n_text_ctx, dims.n_text_ctx).fill_(-np.inf).triu_(1)
+            all_heads = torch.zeros(dims.n_text_layer, dims.n_text_head, dtype=torch.bool)
+            all_heads[dims.n_text_layer // 2:] = True
+            model.alignment_heads = all_heads.to_sparse()
+            if self.model_name in whisper._ALIGNMENT_HEADS:
+                model.set_alignment_heads(whisper._ALIGNMENT_HEADS[self.model_name])
+            
+            if any(t.is_meta for t in list(model.parameters()) + list(model.buffers())):
+                raise RuntimeError("uninitialized tensors left on meta device")
+            
+            logger.info("⚡ Whisper weights loaded via mmap")
+            model = model.to(self.device)
+            # assign=True keeps the checkpoint's fp16 tensors; CUDA halves the model anyway,
+            # but on CPU every forward pass would upcast them
+            return model if self.device == "cuda" else model.float()
+            
+        except Exception as e:
+            logger.warning(f"⚠️ mmap Whisper load unavailable ({e}), using standard loader")
+            return whisper.load_model(
+                self.model_name,
+                device=self.device,
+                download_root=download_root,
+                in_memory=False
+            )
+    
     async def transcribe(
         self, 
         audio_data: bytes, 
@@ -74,17 +135,22 @@ class STTService:
         """Transcribe audio data to text"""
         start_time = time.time()
         
+        buffer = None
+        
         try:
-            # Convert audio data to temporary file
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                temp_file.write(audio_data)
-                temp_file_path = temp_file.name
+            # Read the container header once: validates duration and picks the decode path
+            meta = sniff_audio_header(bytes(audio_data[:AUDIO_HEADER_SIZE]))
+            if meta.duration and meta.duration > settings.max_audio_duration:
+                raise ValueError(f"Audio too long: {meta.duration:.1f}s (max {settings.max_audio_duration}s)")
             
-            # Process audio with Whisper
-            result = await self._process_audio_file(temp_file_path, language)
+            # Decode to 16 kHz mono PCM and scale into a pooled float32 buffer
+            pcm = await self._decode_pcm16(audio_data, meta.format)
+            buffer = stt_buffer_pool.acquire(len(pcm))
+            audio_array = buffer[:len(pcm)]
+            np.multiply(pcm, 1.0 / 32768.0, out=audio_array, casting="unsafe")
             
-            # Cleanup
-            Path(temp_file_path).unlink(missing_ok=True)
+            # Process audio with Whisper
+            result = await self._process_audio_file(audio_array, language)
             
             processing_time = time.time() - start_time
             self.processing_times.append(processing_time)
@@ -100,12 +166,72 @@ class STTService:
                 "device_used": self.device
             }
             
+        except asyncio.CancelledError:
+            # Whisper may still be reading the buffer in its thread; let GC reclaim it
+            buffer = None
+            raise
         except Exception as e:
             logger.error(f"❌ Transcription failed: {e}")
             raise
+        finally:
+            if buffer is not None:
+                stt_buffer_pool.release(buffer)
+    
+    async def transcribe_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        language: str = "auto"
+    ) -> Dict[str, Any]:
+        """Transcribe audio delivered as a stream of byte chunks, collected in a pooled buffer"""
+        buffer = upload_buffer_pool.acquire(0)
+        filled = 0
+        
+        try:
+            async for chunk in chunks:
+                end = filled + len(chunk)
+                if end > len(buffer):
+                    # Move up to the next pool size and hand the outgrown buffer back
+                    larger = upload_buffer_pool.acquire(max(end, 2 * len(buffer)))
+                    larger[:filled] = memoryview(buffer)[:filled]
+                    upload_buffer_pool.release(buffer)
+                    buffer = larger
+                buffer[filled:end] = chunk
+                filled = end
+            
+            if not filled:
+                raise ValueError("Empty audio stream")
+            
+            return await self.transcribe(memoryview(buffer)[:filled], language=language)
+        
+        except asyncio.CancelledError:
+            # The decode thread may still be reading the buffer; let GC reclaim it
+            buffer = None
+            raise
+        finally:
+            if buffer is not None:
+                upload_buffer_pool.release(buffer)
     
-    async def _process_audio_file(self, file_path: str, language: str) -> Dict:
-        """Process audio file with Whisper"""
+    async def _decode_pcm16(self, audio_data: bytes, audio_format: Optional[str] = None) -> np.ndarray:
+        """Decode audio to 16 kHz mono int16 samples off the event loop"""
+        if self.cpu_pool is not None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.cpu_pool, decode_to_pcm16, bytes(audio_data), WHISPER_SAMPLE_RATE, audio_format
+            )
+        return await asyncio.to_thread(decode_to_pcm16, audio_data, WHISPER_SAMPLE_RATE, audio_format)
+    
+    def _run_whisper(self, audio: Union[str, np.ndarray], options: Dict[str, Any]) -> Dict:
+        """Blocking Whisper call; the lock keeps concurrent requests off the shared model"""
+        with self._model_lock:
+            if self.device == "cuda":
+                # GPU optimized transcription on the STT stream; results come back via
+                # blocking .cpu() copies on that stream, so no extra sync is needed
+                with torch.cuda.stream(self.cuda_stream), torch.cuda.amp.autocast():
+                    return self.model.transcribe(audio, **options)
+            return self.model.transcribe(audio, **options)
+    
+    async def _process_audio_file(self, audio: Union[str, np.ndarray], language: str) -> Dict:
+        """Process an audio file path or float32 sample array with Whisper"""
         try:
             # Prepare options
             options = {
@@ -127,15 +253,8 @@ class STTService:
             if language != "auto":
                 options["language"] = language
             
-            # Run transcription
-            if self.device == "cuda":
-                # GPU optimized transcription
-                with torch.cuda.amp.autocast():
-                    result = self.model.transcribe(file_path, **options)
-            else:
-                result = self.model.transcribe(file_path, **options)
-            
-            return result
+            # Run transcription without blocking the event loop
+            return await asyncio.to_thread(self._run_whisper, audio, options)
             
         except Exception as e:
             logger.error(f"❌ Audio processing failed: {e}")
@@ -290,6 +409,9 @@ class STTService:
     async def cleanup(self):
         """Cleanup resources"""
         try:
+            if self.cpu_pool is not None:
+                self.cpu_pool.shutdown(wait=False, cancel_futures=True)
+                self.cpu_pool = None
             if self.device == "cuda":
                 torch.cuda.empty_cache()
             self.model = None
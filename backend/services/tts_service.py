@@ -8,10 +8,15 @@ import logging
 import time
 import tempfile
 import os
-from typing import Optional, Dict, List, Any
+import uuid
+from collections import deque
+from typing import Optional, Dict, List, Any, AsyncIterator
 from pathlib import Path
+from dataclasses import dataclass
 import json
 
+from utils.audio_utils import build_streaming_wav_header, conform_pcm, split_wav
+
 # Import VibeVoice service
 try:
     from .vibevoice_service import VibeVoiceService
@@ -34,6 +39,13 @@ except ImportError as e:
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class TTSResult:
+    """Synthesized audio together with the time it took to generate"""
+    audio: bytes
+    processing_time: float
+
+
 class VoiceProfile:
     """Voice profile with customization settings"""
     def __init__(self, name: str, voice_id: str, description: str, 
@@ -54,7 +66,8 @@ class TTSService:
     """Advanced TTS Service with Microsoft Neural Voices"""
     
     def __init__(self):
-        self.last_processing_time = 0
+        # Recent successful synthesis times; aggregates stay meaningful under concurrent requests
+        self.processing_times: deque = deque(maxlen=100)
         self.available_voices: Dict[str, Dict] = {}
         self.voice_profiles: Dict[str, VoiceProfile] = {}
         self.default_voice = "en-US-AvaNeural"  # Expressive, caring voice optimized for conversation
@@ -222,6 +235,28 @@ class TTSService:
         emotion: str = "neutral",
         output_format: str = "wav"
     ) -> bytes:
+        """Generate speech and return only the audio bytes (see synthesize)"""
+        result = await self.synthesize(
+            text=text,
+            voice=voice,
+            speed=speed,
+            pitch=pitch,
+            volume=volume,
+            emotion=emotion,
+            output_format=output_format
+        )
+        return result.audio
+    
+    async def synthesize(
+        self,
+        text: str,
+        voice: str = None,
+        speed: float = 1.0,
+        pitch: float = 1.0,
+        volume: float = 1.0,
+        emotion: str = "neutral",
+        output_format: str = "wav"
+    ) -> TTSResult:
         """Generate high-quality speech using Microsoft Neural Voices
         
         Args:
@@ -234,7 +269,7 @@ class TTSService:
             output_format: Output format (wav, mp3)
             
         Returns:
-            Audio data as bytes
+            TTSResult with audio bytes and this call's processing time
         """
         start_time = time.time()
         
@@ -244,13 +279,16 @@ class TTSService:
                 vibevoice_voice = voice[10:]  # Remove "vibevoice_" prefix
                 logger.info(f"🎙️ Using VibeVoice for generation: '{text[:50]}...'")
                 
-                return await self.vibevoice_service.generate_speech(
+                audio_data = await self.vibevoice_service.generate_speech(
                     text=text,
                     voice=vibevoice_voice,
                     output_format=output_format,
                     speed=speed,
                     emotion=emotion
                 )
+                processing_time = time.time() - start_time
+                self.processing_times.append(processing_time)
+                return TTSResult(audio=audio_data, processing_time=processing_time)
             
             # Use Edge-TTS for regular voices
             if not EDGE_TTS_AVAILABLE:
@@ -279,27 +317,90 @@ class TTSService:
             # Ensure temp directory exists
             self.temp_dir.mkdir(parents=True, exist_ok=True)
             
-            # Save to temporary file
-            temp_file = self.temp_dir / f"tts_{int(time.time() * 1000)}.mp3"
-            await tts.save(str(temp_file))
-            
-            # Load and process audio
-            audio_data = await self._process_audio(temp_file, output_format)
-            
-            # Cleanup temp file
-            temp_file.unlink(missing_ok=True)
+            # Save to a per-call temporary file; streamed sentences synthesize concurrently
+            temp_file = self.temp_dir / f"tts_{uuid.uuid4().hex}.mp3"
+            try:
+                await tts.save(str(temp_file))
+                
+                # Load and process audio
+                audio_data = await self._process_audio(temp_file, output_format)
+            finally:
+                temp_file.unlink(missing_ok=True)
             
-            self.last_processing_time = time.time() - start_time
+            processing_time = time.time() - start_time
+            self.processing_times.append(processing_time)
             
-            logger.info(f"✅ Speech generated in {self.last_processing_time:.2f}s ({len(audio_data)} bytes)")
+            logger.info(f"✅ Speech generated in {processing_time:.2f}s ({len(audio_data)} bytes)")
             
-            return audio_data
+            return TTSResult(audio=audio_data, processing_time=processing_time)
             
         except Exception as e:
-            self.last_processing_time = time.time() - start_time
-            logger.error(f"❌ Speech generation failed after {self.last_processing_time:.2f}s: {e}")
+            logger.error(f"❌ Speech generation failed after {time.time() - start_time:.2f}s: {e}")
             raise Exception(f"TTS generation failed: {str(e)}")
     
+    async def generate_speech_stream(
+        self,
+        text_chunks: AsyncIterator[str],
+        voice: str = None,
+        **kwargs
+    ) -> AsyncIterator[bytes]:
+        """Synthesize text chunks concurrently and yield one continuous WAV stream
+        
+        Each chunk (typically a sentence) is dispatched to generate_speech as soon
+        as it arrives; audio is emitted in chunk order behind a single streaming
+        WAV header.
+        
+        Args:
+            text_chunks: Async iterator of text segments to synthesize
+            voice: Voice ID or profile name
+            **kwargs: Extra generate_speech options (speed, pitch, volume, emotion)
+            
+        Yields:
+            WAV header followed by raw PCM frames
+        """
+        voice = voice or self.default_voice
+        queue: asyncio.Queue = asyncio.Queue()
+        pending: List[asyncio.Task] = []
+        
+        async def dispatch():
+            try:
+                async for chunk in text_chunks:
+                    if not chunk.strip():
+                        continue
+                    task = asyncio.create_task(
+                        self.generate_speech(text=chunk, voice=voice, output_format="wav", **kwargs)
+                    )
+                    pending.append(task)
+                    await queue.put(task)
+            except Exception as e:
+                await queue.put(e)
+            finally:
+                await queue.put(None)
+        
+        producer = asyncio.create_task(dispatch())
+        stream_params = None
+        
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                
+                params, frames = split_wav(await item)
+                if stream_params is None:
+                    stream_params = params
+                    yield build_streaming_wav_header(*stream_params)
+                else:
+                    # Conform mismatched segments to the format announced in the header
+                    frames = conform_pcm(frames, params, stream_params)
+                yield frames
+        finally:
+            producer.cancel()
+            for task in pending:
+                task.cancel()
+    
     def _resolve_voice_id(self, voice: Optional[str]) -> str:
         """Resolve voice profile name to voice ID"""
         if not voice:
@@ -367,10 +468,6 @@ class TTSService:
             # Return original file as fallback
             return audio_file.read_bytes()
     
-    async def get_last_processing_time(self) -> float:
-        """Get last processing time"""
-        return self.last_processing_time
-    
     def get_available_voices(self) -> Dict[str, Dict]:
         """Get all available voices"""
         return self.available_voices.copy()
@@ -402,7 +499,8 @@ class TTSService:
             "available_voices": len(self.available_voices),
             "voice_profiles": len(self.voice_profiles),
             "default_voice": self.default_voice,
-            "last_processing_time": self.last_processing_time,
+            "average_time": sum(self.processing_times) / len(self.processing_times) if self.processing_times else 0,
+            "recent_processed": len(self.processing_times),
             "temp_dir": str(self.temp_dir),
             "edge_tts_available": EDGE_TTS_AVAILABLE
         }
@@ -5,26 +5,34 @@ High-quality conversational AI voices for long-form synthesis
 """
 
 import asyncio
+import contextlib
 import logging
 import time
 import tempfile
 import os
 import io
 import subprocess
-from typing import Optional, Dict, List, Any, Union, Tuple
+import functools
+import importlib.util
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, AsyncIterator, BinaryIO, Optional, Dict, List, Any, Union, Tuple
 from pathlib import Path
 import json
 from dataclasses import dataclass
 from enum import Enum
 
-# Import ONNX acceleration service
-try:
-    from services.onnx_acceleration_service import ONNXAccelerationService, AccelerationType
-    from utils.onnx_converter import ONNXConverter
-    ONNX_ACCELERATION_AVAILABLE = True
-except ImportError:
-    ONNX_ACCELERATION_AVAILABLE = False
+from utils.audio_utils import build_streaming_wav_header, concat_audio_segments, conform_pcm, split_wav
+from utils.micro_batcher import MicroBatcher
+
+# ONNX acceleration is imported in initialize(), so onnxruntime only loads when it is used
+ONNX_ACCELERATION_AVAILABLE = importlib.util.find_spec("onnxruntime") is not None
+if not ONNX_ACCELERATION_AVAILABLE:
     print("Warning: ONNX acceleration not available")
+if TYPE_CHECKING:
+    from services.onnx_acceleration_service import ONNXAccelerationService
+    from utils.onnx_converter import ONNXConverter
 
 try:
     # Setup CUDA environment first
@@ -102,6 +110,12 @@ class TTSRequest:
     speaker_mapping: Optional[Dict[str, str]] = None
 
 
+# Speaker indicator at the start of a conversation script line
+_SPEAKER_LINE_RE = re.compile(
+    r'^(Speaker \d+|Host|Guest|Interviewer|Interviewee|\[S\d+\])\s*:\s*(.*)$', re.IGNORECASE
+)
+
+
 class VibeVoiceService:
     """Advanced TTS Service with multiple engine support + RTX 5090 GPU acceleration"""
 
@@ -113,10 +127,25 @@ class VibeVoiceService:
         self.device = self._get_optimal_device()
         
         # ONNX GPU acceleration service for RTX 5090
-        self.onnx_acceleration: Optional[ONNXAccelerationService] = None
-        self.onnx_converter: Optional[ONNXConverter] = None
+        self.onnx_acceleration: Optional["ONNXAccelerationService"] = None
+        self.onnx_converter: Optional["ONNXConverter"] = None
         self.gpu_acceleration_enabled = False
         
+        # Loaded VibeVoice (processor, model) pairs keyed by model path
+        self._model_cache: Dict[str, Tuple[Any, Any]] = {}
+        # Loads happen from the request path and the generate thread; one load per model
+        self._model_lock = threading.Lock()
+        # Set by warmup_and_capture(); models loaded afterwards get a CUDA-graphed diffusion head
+        self.cuda_graphs_enabled = False
+        # Dedicated CUDA stream so VibeVoice kernels don't queue behind Whisper's
+        self.cuda_stream = torch.cuda.Stream() if TORCH_AVAILABLE and self.device == "cuda" else None
+        
+        # Concurrent VibeVoice requests share one generate() call per model
+        self._batcher = MicroBatcher(self._generate_vibevoice_batch, max_batch_size=4, window_ms=10, name="VibeVoice")
+        # All generate() calls run on one thread: torch.compile's CUDA graphs are recorded
+        # per thread, so warmup capture and request-time replay have to share it
+        self._generate_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vibevoice-generate")
+        
         # Initialize available engines
         self._initialize_voice_configs()
         
@@ -280,11 +309,15 @@ class VibeVoiceService:
         """Initialize the TTS service with RTX 5090 GPU acceleration"""
         try:
             logger.info(f"🎙️ Initializing VibeVoice service on {self.device}")
+            self._batcher.start()
             
             # Initialize ONNX GPU acceleration for RTX 5090
             if ONNX_ACCELERATION_AVAILABLE:
                 try:
                     logger.info("🚀 Initializing RTX 5090 GPU acceleration...")
+                    from services.onnx_acceleration_service import ONNXAccelerationService
+                    from utils.onnx_converter import ONNXConverter
+                    
                     self.onnx_acceleration = ONNXAccelerationService()
                     await self.onnx_acceleration.initialize()
                     
@@ -463,46 +496,149 @@ class VibeVoiceService:
         else:
             raise ValueError(f"Unsupported engine: {engine}")
 
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _load_speaker_sample(path: str, mtime: float, sampling_rate: int) -> np.ndarray:
+        """Load and resample a speaker reference once per (path, mtime)"""
+        wav, _ = librosa.load(path, sr=sampling_rate, mono=True)
+        wav = wav.astype(np.float32)
+        wav.flags.writeable = False
+        return wav
+
+    def _load_speaker_samples(self, paths: List[str], sampling_rate: int) -> List[np.ndarray]:
+        """Blocking: decode speaker references, reusing cached ones whose file hasn't changed"""
+        return [self._load_speaker_sample(path, os.path.getmtime(path), sampling_rate) for path in paths]
+
+    def _load_vibevoice_model(self, model_path: str) -> Tuple[Any, Any]:
+        """Load VibeVoice processor and model once per model path (thread-safe)"""
+        cached = self._model_cache.get(model_path)
+        if cached is not None:
+            return cached
+        
+        with self._model_lock:
+            if model_path not in self._model_cache:
+                self._model_cache[model_path] = self._load_vibevoice_model_locked(model_path)
+            return self._model_cache[model_path]
+    
+    def _load_vibevoice_model_locked(self, model_path: str) -> Tuple[Any, Any]:
+        """Build the processor and model; callers hold _model_lock"""
+        from vibevoice.modular.modeling_vibevoice_inference import VibeVoiceForConditionalGenerationInference
+        from vibevoice.processor.vibevoice_processor import VibeVoiceProcessor
+        
+        processor = VibeVoiceProcessor.from_pretrained(model_path)
+        
+        # Configure model loading based on device
+        if self.device == "mps":
+            load_dtype = torch.float32
+            attn_impl = "sdpa"
+        elif self.device == "cuda":
+            load_dtype = torch.bfloat16
+            # Try flash_attention_2 first, fallback to sdpa if not available
+            try:
+                import flash_attn
+                attn_impl = "flash_attention_2"
+                logger.info("✅ Using Flash Attention 2 for acceleration")
+            except ImportError:
+                attn_impl = "sdpa"
+                logger.info("ℹ️ Flash Attention not available, using SDPA (Scaled Dot Product Attention)")
+        else:
+            load_dtype = torch.float32
+            attn_impl = "sdpa"
+        
+        # low_cpu_mem_usage builds on the meta device and assigns weights straight
+        # from the (mmap'd safetensors) checkpoint instead of staging a full CPU copy
+        model = VibeVoiceForConditionalGenerationInference.from_pretrained(
+            model_path,
+            torch_dtype=load_dtype,
+            attn_implementation=attn_impl,
+            device_map=self.device if self.device != "cpu" else None,
+            low_cpu_mem_usage=True,
+        )
+        
+        if self.device == "mps":
+            model.to("mps")
+            
+        model.eval()
+        model.set_ddpm_inference_steps(num_steps=10)
+        
+        if self.cuda_graphs_enabled:
+            self._enable_cuda_graphs(model)
+        
+        logger.info(f"📦 VibeVoice model loaded and cached: {model_path}")
+        return processor, model
+
+    def _enable_cuda_graphs(self, model: Any) -> None:
+        """Compile the diffusion head so its denoising steps replay as CUDA graphs
+        
+        The head's batch dimension follows the micro-batch size and shrinks as samples
+        finish, so fixed-size manual capture would rarely match. A dynamic compile keeps
+        one compiled graph; warmup_and_capture() and capture_batch_graphs() record the CUDA
+        graphs for batch size 1 and max_batch_size, other sizes are recorded on first use.
+        """
+        inner = getattr(model, "model", None)
+        head = getattr(inner, "prediction_head", None)
+        if head is None:
+            logger.info("ℹ️ VibeVoice prediction head not found, CUDA graphs skipped")
+            return
+        
+        try:
+            inner.prediction_head = torch.compile(head, mode="reduce-overhead", dynamic=True)
+            logger.info("📸 VibeVoice diffusion head compiled with CUDA graphs")
+        except Exception as e:
+            logger.warning(f"⚠️ CUDA graph compilation failed, using eager mode: {e}")
+
+    async def warmup_and_capture(self, voice: str = "vibevoice-alice", use_cuda_graphs: bool = True) -> None:
+        """Load the default VibeVoice model and run one short generation on the GPU
+        
+        The warmup allocates the CUDA workspace and, when enabled, records the
+        diffusion head's CUDA graph for single requests. Larger batches are recorded by
+        capture_batch_graphs() after startup so the app does not wait on them.
+        """
+        if not TORCH_AVAILABLE or self.device != "cuda":
+            return
+        
+        # torch.compile needs Triton, which is usually missing on Windows
+        self.cuda_graphs_enabled = use_cuda_graphs and importlib.util.find_spec("triton") is not None
+        if use_cuda_graphs and not self.cuda_graphs_enabled:
+            logger.info("ℹ️ Triton not installed, VibeVoice runs without CUDA graphs")
+        
+        start_time = time.time()
+        try:
+            await self.generate_speech(text="Hello there.", voice=voice, use_gpu_acceleration=False)
+            if self.cuda_graphs_enabled:
+                # The first call records the graph, the second replays it
+                await self.generate_speech(text="Hello there.", voice=voice, use_gpu_acceleration=False)
+            logger.info(f"🔥 VibeVoice warmed up in {time.time() - start_time:.2f}s")
+        except Exception as e:
+            logger.warning(f"⚠️ VibeVoice warmup failed: {e}")
+
+    async def capture_batch_graphs(self, voice: str = "vibevoice-alice") -> None:
+        """Record the diffusion head's CUDA graph for a full micro-batch
+        
+        Meant to run as a background task once the app is serving. Sizes between 1 and
+        max_batch_size are recorded on first use by the dynamic compile.
+        """
+        if not self.cuda_graphs_enabled:
+            return
+        
+        batch_size = self._batcher.max_batch_size
+        start_time = time.time()
+        try:
+            # Concurrent submissions are batched together; two rounds record, then replay
+            for _ in range(2):
+                await asyncio.gather(*(
+                    self.generate_speech(text="Hello there.", voice=voice, use_gpu_acceleration=False)
+                    for _ in range(batch_size)
+                ))
+            logger.info(f"🔥 VibeVoice batch-{batch_size} CUDA graph captured in {time.time() - start_time:.2f}s")
+        except Exception as e:
+            logger.warning(f"⚠️ VibeVoice batch graph capture failed: {e}")
+
     async def _generate_vibevoice(self, request: TTSRequest) -> bytes:
         """Generate speech using VibeVoice"""
         try:
-            from vibevoice.modular.modeling_vibevoice_inference import VibeVoiceForConditionalGenerationInference
-            from vibevoice.processor.vibevoice_processor import VibeVoiceProcessor
-            
-            # Load model and processor
-            model_path = request.voice_config.model_path
-            processor = VibeVoiceProcessor.from_pretrained(model_path)
-            
-            # Configure model loading based on device
-            if self.device == "mps":
-                load_dtype = torch.float32
-                attn_impl = "sdpa"
-            elif self.device == "cuda":
-                load_dtype = torch.bfloat16
-                # Try flash_attention_2 first, fallback to sdpa if not available
-                try:
-                    import flash_attn
-                    attn_impl = "flash_attention_2"
-                    logger.info("✅ Using Flash Attention 2 for acceleration")
-                except ImportError:
-                    attn_impl = "sdpa"
-                    logger.info("ℹ️ Flash Attention not available, using SDPA (Scaled Dot Product Attention)")
-            else:
-                load_dtype = torch.float32
-                attn_impl = "sdpa"
-                
-            model = VibeVoiceForConditionalGenerationInference.from_pretrained(
-                model_path,
-                torch_dtype=load_dtype,
-                attn_implementation=attn_impl,
-                device_map=self.device if self.device != "cpu" else None,
-            )
-            
-            if self.device == "mps":
-                model.to("mps")
-                
-            model.eval()
-            model.set_ddpm_inference_steps(num_steps=10)
+            # Load model and processor off the event loop (cached after first use)
+            processor, model = await asyncio.to_thread(self._load_vibevoice_model, request.voice_config.model_path)
             
             # Prepare voice samples - handle multi-speaker scenarios
             voice_samples = []
@@ -549,41 +685,22 @@ class VibeVoiceService:
             
             logger.info(f"🎤 Final voice samples ({len(valid_voice_samples)}): {[Path(vs).name for vs in valid_voice_samples]}")
             
-            # Process text and generate
-            inputs = processor(
-                text=[request.text],
-                voice_samples=[valid_voice_samples],  # Use validated voice samples
-                padding=True,
-                return_tensors="pt",
-                return_attention_mask=True,
-            )
+            # Decoded speaker audio is cached per file version; a miss decodes and resamples, so keep it off the loop
+            sampling_rate = getattr(processor.audio_processor, "sampling_rate", 24000)
+            speaker_audio = await asyncio.to_thread(self._load_speaker_samples, valid_voice_samples, sampling_rate)
             
-            # Move to device
-            for k, v in inputs.items():
-                if torch.is_tensor(v):
-                    inputs[k] = v.to(self.device)
-            
-            # Generate audio
-            outputs = model.generate(
-                **inputs,
-                max_new_tokens=None,
-                cfg_scale=1.3,
-                tokenizer=processor.tokenizer,
-                generation_config={'do_sample': False},
-                verbose=False,
+            # Generation is batched with any other VibeVoice requests arriving in the same window
+            audio_tensor = await self._batcher.submit(
+                (request.voice_config.model_path, request.text, speaker_audio)
             )
             
             # Convert to audio bytes
-            if outputs.speech_outputs and outputs.speech_outputs[0] is not None:
+            if audio_tensor is not None:
                 # Convert BFloat16 to float32 for numpy compatibility
-                audio_tensor = outputs.speech_outputs[0].cpu()
                 if audio_tensor.dtype == torch.bfloat16:
                     audio_tensor = audio_tensor.to(torch.float32)
                 audio_array = audio_tensor.numpy()
                 
-                # Convert to bytes
-                temp_file = self.temp_dir / f"vibevoice_{int(time.time() * 1000)}.wav"
-                
                 # Ensure audio array is in the right format
                 if audio_array.ndim > 1:
                     # If multi-channel, take the first channel or flatten
@@ -598,18 +715,76 @@ class VibeVoiceService:
                 
                 logger.info(f"🎵 Audio array shape: {audio_array.shape}, dtype: {audio_array.dtype}, sample_rate: {request.sample_rate}")
                 
-                sf.write(temp_file, audio_array, request.sample_rate, subtype='PCM_16')
-                
-                audio_bytes = temp_file.read_bytes()
-                temp_file.unlink()
-                
-                return audio_bytes
+                # Encode in memory; batched requests finish together, so timestamped temp files could collide
+                buffer = io.BytesIO()
+                sf.write(buffer, audio_array, request.sample_rate, subtype='PCM_16', format='WAV')
+                return buffer.getvalue()
             else:
                 raise Exception("No audio output generated")
                 
         except ImportError:
             raise Exception("VibeVoice not available. Please install: pip install vibevoice")
 
+    async def _generate_vibevoice_batch(self, items: List[Tuple[str, str, List[np.ndarray]]]) -> List[Any]:
+        """Run queued (model_path, text, speaker_audio) items, one generate() per model"""
+        groups: Dict[str, List[int]] = {}
+        for index, (model_path, _, _) in enumerate(items):
+            groups.setdefault(model_path, []).append(index)
+        
+        results: List[Any] = [None] * len(items)
+        for model_path, indices in groups.items():
+            try:
+                outputs = await asyncio.get_running_loop().run_in_executor(
+                    self._generate_executor,
+                    self._run_vibevoice_generate,
+                    model_path,
+                    [items[i][1] for i in indices],
+                    [items[i][2] for i in indices]
+                )
+            except Exception as e:
+                outputs = [e] * len(indices)
+            for index, output in zip(indices, outputs):
+                results[index] = output
+        return results
+
+    def _run_vibevoice_generate(self, model_path: str, texts: List[str], speaker_audio: List[List[np.ndarray]]) -> List[Any]:
+        """Blocking batched VibeVoice generation; returns one CPU audio tensor (or None) per text"""
+        processor, model = self._load_vibevoice_model(model_path)
+        
+        inputs = processor(
+            text=texts,
+            voice_samples=speaker_audio,
+            padding=True,
+            return_tensors="pt",
+            return_attention_mask=True,
+        )
+        
+        stream_ctx = torch.cuda.stream(self.cuda_stream) if self.cuda_stream else contextlib.nullcontext()
+        with stream_ctx:
+            if self.cuda_stream:
+                # Model weights were loaded on the default stream
+                self.cuda_stream.wait_stream(torch.cuda.default_stream())
+            
+            # Move to device
+            for k, v in inputs.items():
+                if torch.is_tensor(v):
+                    inputs[k] = v.to(self.device)
+            
+            # Generate audio
+            outputs = model.generate(
+                **inputs,
+                max_new_tokens=None,
+                cfg_scale=1.3,
+                tokenizer=processor.tokenizer,
+                generation_config={'do_sample': False},
+                verbose=False,
+            )
+            
+            # Blocking copies on this stream, so the host sees finished audio
+            speech_outputs = list(outputs.speech_outputs or [])
+            speech_outputs += [None] * (len(texts) - len(speech_outputs))
+            return [audio.cpu() if audio is not None else None for audio in speech_outputs[:len(texts)]]
+
     async def _generate_dia_tts(self, request: TTSRequest) -> bytes:
         """Generate speech using Dia TTS"""
         # Placeholder for Dia TTS implementation
@@ -760,6 +935,8 @@ class VibeVoiceService:
     
     async def _load_onnx_model(self, voice_config: VoiceConfig, model_name: str) -> None:
         """Load or convert model to ONNX format for GPU acceleration"""
+        from services.onnx_acceleration_service import AccelerationType
+        
         try:
             # Check if ONNX model already exists
             onnx_path = self.temp_dir / f"{model_name}_rtx5090_optimized.onnx"
@@ -769,7 +946,7 @@ class VibeVoiceService:
                 await self.onnx_acceleration.load_model(
                     model_path=str(onnx_path),
                     model_name=model_name,
-                    acceleration_type=AccelerationType.CUDA
+                    acceleration_type=AccelerationType.TENSORRT
                 )
             else:
                 logger.info(f"🔄 Converting {voice_config.engine.value} to ONNX format...")
@@ -828,6 +1005,8 @@ class VibeVoiceService:
     
     async def _create_placeholder_onnx_model(self, model_name: str) -> None:
         """Create a placeholder ONNX model for testing GPU acceleration"""
+        from services.onnx_acceleration_service import AccelerationType
+        
         try:
             logger.info(f"🔧 Creating placeholder ONNX model for testing: {model_name}")
             
@@ -856,7 +1035,7 @@ class VibeVoiceService:
             await self.onnx_acceleration.load_model(
                 model_path=str(model_path),
                 model_name=model_name,
-                acceleration_type=AccelerationType.CUDA
+                acceleration_type=AccelerationType.TENSORRT
             )
             
             logger.info(f"✅ Placeholder ONNX model created and loaded")
@@ -890,6 +1069,15 @@ class VibeVoiceService:
             if self.onnx_converter:
                 self.onnx_converter.cleanup()
             
+            await self._batcher.stop()
+            self._generate_executor.shutdown(wait=False)
+            
+            # Release cached VibeVoice models and speaker samples
+            self._model_cache.clear()
+            self._load_speaker_sample.cache_clear()
+            if TORCH_AVAILABLE and torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            
             # Clean up cached test audio files (keep voice samples and metadata)
             self._cleanup_old_cache_files()
             
@@ -943,28 +1131,23 @@ class VibeVoiceService:
         try:
             # Parse the script for speakers
             segments = self._parse_conversation_script(script)
+            if not segments:
+                raise ValueError("No speaker segments found in script")
             
-            # Generate audio for each segment
-            audio_segments = []
+            # Resolve each speaker's voice once rather than per segment
+            voices = {speaker: speaker_voices.get(speaker, "vibevoice-alice") for speaker, _ in segments}
             
-            for speaker, text in segments:
-                voice = speaker_voices.get(speaker, "vibevoice-alice")
-                audio_data = await self.generate_speech(
-                    text=text,
-                    voice=voice,
-                    output_format=output_format
-                )
-                
-                # Convert to AudioSegment for concatenation
-                audio_segment = AudioSegment.from_file(io.BytesIO(audio_data))
-                audio_segments.append(audio_segment)
-                
-                # Add small pause between speakers
-                pause = AudioSegment.silent(duration=500)  # 500ms pause
-                audio_segments.append(pause)
+            # Submit every segment at once so they share VibeVoice micro-batches
+            segment_audio = await asyncio.gather(*(
+                self.generate_speech(text=text, voice=voices[speaker], output_format=output_format)
+                for speaker, text in segments
+            ))
+            
+            # Convert to AudioSegment for concatenation
+            audio_segments = [AudioSegment.from_file(io.BytesIO(audio_data)) for audio_data in segment_audio]
             
-            # Concatenate all segments
-            final_audio = sum(audio_segments)
+            # Concatenate all segments with a small pause after each speaker
+            final_audio = concat_audio_segments(audio_segments, pause_ms=500)
             
             # Export to bytes
             buffer = io.BytesIO()
@@ -976,10 +1159,55 @@ class VibeVoiceService:
             logger.error(f"Conversation creation failed: {e}")
             raise
 
+    def stream_conversation(
+        self,
+        script: str,
+        speaker_voices: Dict[str, str],
+        pause_ms: int = 500
+    ) -> AsyncIterator[bytes]:
+        """Stream a multi-speaker conversation as one WAV: header, then each segment's PCM in order
+        
+        The script is parsed upfront so an invalid script fails before any audio is sent.
+        """
+        segments = self._parse_conversation_script(script)
+        if not segments:
+            raise ValueError("No speaker segments found in script")
+        
+        voices = {speaker: speaker_voices.get(speaker, "vibevoice-alice") for speaker, _ in segments}
+        return self._iter_conversation(segments, voices, pause_ms)
+
+    async def _iter_conversation(
+        self,
+        segments: List[Tuple[str, str]],
+        voices: Dict[str, str],
+        pause_ms: int
+    ) -> AsyncIterator[bytes]:
+        # Dispatch every segment now (they share VibeVoice batches) and emit them in script order
+        tasks = [
+            asyncio.create_task(self.generate_speech(text=text, voice=voices[speaker], output_format="wav"))
+            for speaker, text in segments
+        ]
+        stream_params = None
+        pause = b""
+        
+        try:
+            for task in tasks:
+                params, frames = split_wav(await task)
+                if stream_params is None:
+                    stream_params = params
+                    sample_rate, channels, sample_width = params
+                    pause = bytes(int(sample_rate * pause_ms / 1000) * channels * sample_width)
+                    yield build_streaming_wav_header(*stream_params)
+                else:
+                    frames = conform_pcm(frames, params, stream_params)
+                yield frames
+                yield pause
+        finally:
+            for task in tasks:
+                task.cancel()
+
     def _parse_conversation_script(self, script: str) -> List[Tuple[str, str]]:
         """Parse a conversation script into (speaker, text) segments"""
-        import re
-        
         segments = []
         lines = script.strip().split('\n')
         
@@ -992,7 +1220,7 @@ class VibeVoiceService:
                 continue
             
             # Check for speaker indicators
-            speaker_match = re.match(r'^(Speaker \d+|Host|Guest|Interviewer|Interviewee|\[S\d+\])\s*:\s*(.*)$', line, re.IGNORECASE)
+            speaker_match = _SPEAKER_LINE_RE.match(line)
             
             if speaker_match:
                 # Save previous segment
@@ -1019,14 +1247,19 @@ class VibeVoiceService:
         self,
         name: str,
         transcript: str,
-        audio_data: bytes,
+        audio_data: Union[bytes, BinaryIO],
         description: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Create a voice clone from uploaded audio and transcript"""
+        """Create a voice clone from uploaded audio and transcript
+
+        ``audio_data`` may be raw bytes or a readable file object such as the
+        upload's spooled temp file, which is decoded in place without copying.
+        """
         start_time = time.time()
         
         try:
-            logger.info(f"🎤 Creating voice clone '{name}' with {len(audio_data)} bytes of audio")
+            logger.info(f"🎤 Creating voice clone '{name}'")
+            audio_source = io.BytesIO(audio_data) if isinstance(audio_data, (bytes, bytearray)) else audio_data
             
             # Generate unique voice ID
             voice_id = f"voice_clone_{int(time.time() * 1000)}"
@@ -1036,7 +1269,7 @@ class VibeVoiceService:
             
             # Convert audio data to wav if needed
             try:
-                audio_segment = AudioSegment.from_file(io.BytesIO(audio_data))
+                audio_segment = AudioSegment.from_file(audio_source)
                 audio_segment.export(voice_sample_path, format="wav")
                 logger.info(f"📁 Voice sample saved to: {voice_sample_path}")
             except Exception as e:
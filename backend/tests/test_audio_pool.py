@@ -0,0 +1,85 @@
+"""
+Float32Pool and BytesPool reuse and size-cap tests
+"""
+
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils.audio_pool import BytesPool, Float32Pool
+
+
+def test_float32_pool_reuses_released_buffers():
+    pool = Float32Pool(capacity=1024, max_buffers=2)
+
+    buffer = pool.acquire(512)
+    assert buffer.shape == (1024,) and buffer.dtype == np.float32
+    pool.release(buffer)
+
+    assert pool.acquire(1000) is buffer
+    assert pool.get_stats()["hits"] == 1
+    assert pool.get_stats()["misses"] == 1
+
+
+def test_float32_pool_oversized_requests_bypass_the_pool():
+    pool = Float32Pool(capacity=1024)
+    pool.preallocate(1)
+
+    buffer = pool.acquire(4096)
+    assert buffer.shape == (4096,)
+    pool.release(buffer)
+
+    stats = pool.get_stats()
+    assert stats["available"] == 1
+    assert stats["misses"] == 1
+
+
+def test_float32_pool_caps_retained_buffers():
+    pool = Float32Pool(capacity=16, max_buffers=2)
+    for buffer in [pool.acquire(16) for _ in range(5)]:
+        pool.release(buffer)
+
+    assert pool.get_stats()["available"] == 2
+
+
+def test_bytes_pool_picks_smallest_standard_size():
+    pool = BytesPool(sizes=(1024, 4096), max_per_size=2)
+
+    assert len(pool.acquire(100)) == 1024
+    assert len(pool.acquire(1024)) == 1024
+    assert len(pool.acquire(1025)) == 4096
+    assert len(pool.acquire(10000)) == 10000
+
+
+def test_bytes_pool_reuses_and_caps_per_size():
+    pool = BytesPool(sizes=(1024,), max_per_size=2)
+
+    buffers = [pool.acquire(1024) for _ in range(3)]
+    for buffer in buffers:
+        pool.release(buffer)
+    pool.release(bytearray(500))  # non-standard sizes are dropped
+
+    assert pool.get_stats()["available"] == {1024: 2}
+    assert pool.acquire(10) is buffers[1]
+    assert pool.get_stats()["hits"] == 1
+    assert pool.get_stats()["misses"] == 3
+
+
+def test_counters_are_consistent_under_threads():
+    pool = BytesPool(sizes=(64,), max_per_size=4)
+    rounds = 500
+
+    def worker():
+        for _ in range(rounds):
+            pool.release(pool.acquire(64))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = pool.get_stats()
+    assert stats["hits"] + stats["misses"] == 8 * rounds
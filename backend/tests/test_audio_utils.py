@@ -0,0 +1,105 @@
+"""
+WAV helper tests: streaming headers, header sniffing, split and PCM conversion
+"""
+
+import struct
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("fastapi")
+pytest.importorskip("pydub")
+
+from utils.audio_utils import (
+    STREAMING_WAV_SIZE,
+    build_streaming_wav_header,
+    conform_pcm,
+    silent_wav,
+    sniff_audio_header,
+    split_wav,
+)
+
+
+def _tone(sample_rate: int, seconds: float = 0.25, channels: int = 1) -> bytes:
+    """Interleaved int16 PCM of a 440 Hz tone"""
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    samples = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16)
+    return np.repeat(samples, channels).tobytes()
+
+
+def test_streaming_header_is_44_bytes_with_open_sizes():
+    header = build_streaming_wav_header(24000)
+
+    assert len(header) == 44
+    assert header[:4] == b'RIFF' and header[8:16] == b'WAVEfmt '
+    assert struct.unpack_from('<I', header, 4)[0] == STREAMING_WAV_SIZE
+    assert header[36:40] == b'data'
+    assert struct.unpack_from('<I', header, 40)[0] == STREAMING_WAV_SIZE
+
+
+@pytest.mark.parametrize("params", [(24000, 1, 2), (16000, 2, 2), (44100, 1, 1)])
+def test_streaming_header_round_trips_through_split_wav(params):
+    sample_rate, channels, sample_width = params
+    frames = bytes(range(256)) * (channels * sample_width * 4)
+
+    parsed, parsed_frames = split_wav(build_streaming_wav_header(sample_rate, channels, sample_width) + frames)
+
+    assert parsed == params
+    assert parsed_frames == frames
+
+
+def test_sniff_reads_streaming_header_without_duration():
+    meta = sniff_audio_header(build_streaming_wav_header(24000, 2, 2))
+
+    assert meta.format == 'wav'
+    assert (meta.sample_rate, meta.channels, meta.sample_width) == (24000, 2, 2)
+    assert meta.duration is None
+
+
+def test_split_wav_of_silent_wav():
+    params, frames = split_wav(silent_wav(0.5, 16000))
+
+    assert params == (16000, 1, 2)
+    assert frames == b'\x00\x00' * 8000
+    assert sniff_audio_header(silent_wav(0.5, 16000)).duration == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("header, expected", [
+    (b'OggS' + b'\x00' * 12, 'ogg'),
+    (b'fLaC' + b'\x00' * 12, 'flac'),
+    (b'\x1aE\xdf\xa3' + b'\x00' * 12, 'webm'),
+    (b'\x00\x00\x00\x18ftypmp42', 'mp4'),
+    (b'ID3\x04' + b'\x00' * 12, 'mp3'),
+    (b'not audio at all', None),
+])
+def test_sniff_identifies_containers(header, expected):
+    assert sniff_audio_header(header).format == expected
+
+
+def test_conform_pcm_returns_matching_frames_unchanged():
+    frames = _tone(24000)
+    assert conform_pcm(frames, (24000, 1, 2), (24000, 1, 2)) is frames
+
+
+def test_conform_pcm_resamples_and_upmixes():
+    frames = _tone(16000, seconds=0.5)
+
+    resampled = conform_pcm(frames, (16000, 1, 2), (24000, 1, 2))
+    assert len(resampled) // 2 == pytest.approx(12000, abs=2)
+
+    stereo = conform_pcm(frames, (16000, 1, 2), (16000, 2, 2))
+    assert len(stereo) == 2 * len(frames)
+    left_right = np.frombuffer(stereo, dtype=np.int16).reshape(-1, 2)
+    assert np.array_equal(left_right[:, 0], left_right[:, 1])
+
+
+def test_conformed_segments_concatenate_into_one_stream():
+    target = (24000, 1, 2)
+    segments = [(_tone(16000), (16000, 1, 2)), (_tone(24000, channels=2), (24000, 2, 2))]
+
+    body = b''.join(conform_pcm(frames, params, target) for frames, params in segments)
+    parsed, frames = split_wav(build_streaming_wav_header(*target) + body)
+
+    assert parsed == target
+    assert frames == body
+    assert len(frames) % 2 == 0
@@ -0,0 +1,103 @@
+"""
+MicroBatcher batching and result routing tests
+"""
+
+import asyncio
+from typing import Any, List
+
+import pytest
+
+from utils.micro_batcher import MicroBatcher
+
+
+class RecordingProcessor:
+    """Batch processor that records each batch and echoes its items doubled"""
+
+    def __init__(self):
+        self.batches: List[List[Any]] = []
+
+    async def __call__(self, items: List[Any]) -> List[Any]:
+        self.batches.append(list(items))
+        await asyncio.sleep(0)
+        return [item * 2 for item in items]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submissions_are_batched_up_to_max_size():
+    processor = RecordingProcessor()
+    batcher = MicroBatcher(processor, max_batch_size=3, window_ms=50)
+    try:
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(7)))
+    finally:
+        await batcher.stop()
+
+    assert results == [i * 2 for i in range(7)]
+    assert [len(batch) for batch in processor.batches] == [3, 3, 1]
+    assert sorted(item for batch in processor.batches for item in batch) == list(range(7))
+
+
+@pytest.mark.asyncio
+async def test_results_map_back_to_their_submitters():
+    async def process(items: List[str]) -> List[str]:
+        await asyncio.sleep(0)
+        return [item.upper() for item in items]
+
+    words = ["alpha", "bravo", "charlie", "delta", "echo"]
+    batcher = MicroBatcher(process, max_batch_size=2, window_ms=50)
+    try:
+        results = await asyncio.gather(*(batcher.submit(word) for word in words))
+    finally:
+        await batcher.stop()
+
+    assert results == [word.upper() for word in words]
+
+
+@pytest.mark.asyncio
+async def test_exception_result_is_raised_to_that_submitter_only():
+    async def process(items: List[int]) -> List[Any]:
+        return [ValueError(f"bad {item}") if item < 0 else item for item in items]
+
+    batcher = MicroBatcher(process, max_batch_size=4, window_ms=50)
+    try:
+        results = await asyncio.gather(
+            batcher.submit(1), batcher.submit(-1), batcher.submit(2),
+            return_exceptions=True
+        )
+    finally:
+        await batcher.stop()
+
+    assert results[0] == 1
+    assert isinstance(results[1], ValueError)
+    assert results[2] == 2
+
+
+@pytest.mark.asyncio
+async def test_processor_failure_fails_the_whole_batch():
+    async def process(items: List[int]) -> List[int]:
+        raise RuntimeError("GPU fell over")
+
+    batcher = MicroBatcher(process, max_batch_size=2, window_ms=50)
+    try:
+        results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+    finally:
+        await batcher.stop()
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_stop_fails_the_batch_in_flight():
+    started = asyncio.Event()
+
+    async def process(items: List[int]) -> List[int]:
+        started.set()
+        await asyncio.Event().wait()
+        return items
+
+    batcher = MicroBatcher(process, max_batch_size=2, window_ms=1)
+    submission = asyncio.ensure_future(batcher.submit(1))
+    await started.wait()
+    await batcher.stop()
+
+    with pytest.raises(RuntimeError, match="stopped"):
+        await asyncio.wait_for(submission, timeout=1)
@@ -0,0 +1,82 @@
+"""
+AudioAwareGZipMiddleware routing and backpressure tests
+"""
+
+import gzip
+from typing import List
+
+import pytest
+
+pytest.importorskip("starlette")
+
+from app.middleware import AudioAwareGZipMiddleware
+
+GZIP_SCOPE = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+
+
+def streaming_app(content_type: str, chunks: List[bytes], produced: List[int]):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", content_type.encode())]})
+        for index, chunk in enumerate(chunks):
+            produced.append(index)
+            await send({"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1})
+    return app
+
+
+async def run(app, scope=GZIP_SCOPE):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        sent.append(message)
+
+    await AudioAwareGZipMiddleware(app, minimum_size=10)(scope, receive, send)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_audio_passes_through_untouched():
+    chunks = [b"RIFF" * 100, b"x" * 100]
+    sent = await run(streaming_app("audio/wav", chunks, []))
+
+    assert sent[0]["headers"] == [(b"content-type", b"audio/wav")]
+    assert [message["body"] for message in sent[1:]] == chunks
+
+
+@pytest.mark.asyncio
+async def test_streamed_text_is_gzipped():
+    chunks = [b"y" * 2000, b"z" * 2000]
+    sent = await run(streaming_app("text/plain", chunks, []))
+
+    assert (b"content-encoding", b"gzip") in sent[0]["headers"]
+    assert gzip.decompress(b"".join(message["body"] for message in sent[1:])) == b"".join(chunks)
+
+
+@pytest.mark.asyncio
+async def test_no_accept_encoding_skips_gzip():
+    sent = await run(streaming_app("application/json", [b"{}" * 1000], []), scope={"type": "http", "headers": []})
+
+    assert sent[0]["headers"] == [(b"content-type", b"application/json")]
+
+
+@pytest.mark.asyncio
+async def test_failed_client_send_stops_a_compressed_stream():
+    produced: List[int] = []
+    app = streaming_app("text/plain", [b"chunk" * 100] * 2000, produced)
+    calls = 0
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        nonlocal calls
+        calls += 1
+        if calls > 2:
+            raise OSError("client went away")
+
+    with pytest.raises(OSError):
+        await AudioAwareGZipMiddleware(app, minimum_size=10)(GZIP_SCOPE, receive, send)
+
+    assert len(produced) < 10
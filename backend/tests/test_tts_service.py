@@ -0,0 +1,52 @@
+"""
+TTSService concurrency tests with a stubbed Edge-TTS client
+"""
+
+import asyncio
+import types
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("pydub")
+
+from services import tts_service as tts_module
+
+
+class FakeCommunicate:
+    """Stand-in for edge_tts.Communicate that writes the text as the 'audio'"""
+
+    def __init__(self, text: str, voice: str):
+        self.text = text
+
+    async def save(self, path: str) -> None:
+        await asyncio.sleep(0)
+        Path(path).write_bytes(self.text.encode())
+
+
+@pytest.fixture
+def service(monkeypatch, tmp_path):
+    monkeypatch.setattr(tts_module, "VIBEVOICE_AVAILABLE", False)
+    monkeypatch.setattr(tts_module, "EDGE_TTS_AVAILABLE", True)
+    monkeypatch.setattr(tts_module, "edge_tts", types.SimpleNamespace(Communicate=FakeCommunicate), raising=False)
+
+    service = tts_module.TTSService()
+    service.temp_dir = tmp_path
+
+    async def read_back(audio_file: Path, output_format: str) -> bytes:
+        await asyncio.sleep(0)
+        return audio_file.read_bytes()
+
+    monkeypatch.setattr(service, "_process_audio", read_back)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_concurrent_synthesize_calls_keep_their_own_audio(service, tmp_path):
+    sentences = [f"sentence {i}" for i in range(8)]
+
+    results = await asyncio.gather(*(service.synthesize(text=text, voice=service.default_voice) for text in sentences))
+
+    assert [result.audio for result in results] == [text.encode() for text in sentences]
+    assert list(tmp_path.iterdir()) == []
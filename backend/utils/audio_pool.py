@@ -0,0 +1,111 @@
+"""
+Reusable audio buffers for the STT upload and decode paths
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Whisper consumes 16 kHz mono audio; 30 seconds covers typical voice messages
+WHISPER_SAMPLE_RATE = 16000
+DEFAULT_POOL_SECONDS = 30
+
+
+class Float32Pool:
+    """Thread-safe pool of fixed-capacity float32 buffers"""
+
+    def __init__(self, capacity: int, max_buffers: int = 8):
+        self.capacity = capacity
+        self.max_buffers = max_buffers
+        self._buffers = deque()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def preallocate(self, count: int) -> None:
+        """Allocate buffers upfront so the first requests don't pay for them"""
+        with self._lock:
+            while len(self._buffers) < min(count, self.max_buffers):
+                self._buffers.append(np.empty(self.capacity, dtype=np.float32))
+        logger.info(f"🧮 Audio buffer pool ready: {len(self._buffers)} x {self.capacity} samples")
+
+    def acquire(self, nsamples: int) -> np.ndarray:
+        """Get a buffer holding at least nsamples; oversized requests allocate normally"""
+        with self._lock:
+            if nsamples <= self.capacity and self._buffers:
+                self.hits += 1
+                return self._buffers.pop()
+            self.misses += 1
+
+        return np.empty(max(nsamples, self.capacity), dtype=np.float32)
+
+    def release(self, buffer: np.ndarray) -> None:
+        """Return a buffer to the pool; non-standard buffers are dropped"""
+        if buffer.shape[0] != self.capacity:
+            return
+        with self._lock:
+            if len(self._buffers) < self.max_buffers:
+                self._buffers.append(buffer)
+
+    def get_stats(self) -> dict:
+        """Get pool usage statistics"""
+        with self._lock:
+            return {
+                "capacity_samples": self.capacity,
+                "available": len(self._buffers),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+class BytesPool:
+    """Thread-safe pool of bytearrays in a few standard sizes"""
+
+    def __init__(self, sizes: Tuple[int, ...] = (256 * 1024, 1024 * 1024, 4 * 1024 * 1024), max_per_size: int = 4):
+        self.sizes = sizes
+        self.max_per_size = max_per_size
+        self._buffers = {size: deque() for size in sizes}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, min_size: int) -> bytearray:
+        """Get the smallest standard buffer holding min_size bytes; larger requests allocate normally"""
+        size = next((size for size in self.sizes if size >= min_size), min_size)
+        with self._lock:
+            free = self._buffers.get(size)
+            if free:
+                self.hits += 1
+                return free.pop()
+            self.misses += 1
+
+        return bytearray(size)
+
+    def release(self, buffer: bytearray) -> None:
+        """Return a buffer to the pool; non-standard sizes are dropped"""
+        free = self._buffers.get(len(buffer))
+        if free is None:
+            return
+        with self._lock:
+            if len(free) < self.max_per_size:
+                free.append(buffer)
+
+    def get_stats(self) -> dict:
+        """Get pool usage statistics"""
+        with self._lock:
+            return {
+                "sizes": list(self.sizes),
+                "available": {size: len(free) for size, free in self._buffers.items()},
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+# Process-wide pools shared by STT requests
+stt_buffer_pool = Float32Pool(WHISPER_SAMPLE_RATE * DEFAULT_POOL_SECONDS)
+upload_buffer_pool = BytesPool()
@@ -2,9 +2,14 @@
 Audio utilities for voice processing and validation
 """
 
+import asyncio
+import functools
 import io
 import logging
-from typing import Optional, Tuple
+import struct
+import wave
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Tuple
 from fastapi import UploadFile
 import numpy as np
 from pydub import AudioSegment
@@ -14,45 +19,66 @@ logger = logging.getLogger(__name__)
 # Supported audio formats
 SUPPORTED_FORMATS = {'.wav', '.mp3', '.flac', '.ogg', '.m4a', '.webm'}
 MAX_AUDIO_SIZE = 50 * 1024 * 1024  # 50MB max file size
+UPLOAD_CHUNK_SIZE = 64 * 1024  # Streamed upload read size
+RESPONSE_CHUNK_SIZE = 64 * 1024  # Streamed audio response write size
+
+# Bytes needed to identify a container and read WAV fmt/data headers
+AUDIO_HEADER_SIZE = 4096
+
+# Size placeholder used in RIFF/data headers when the total length is unknown
+STREAMING_WAV_SIZE = 0xFFFFFFFF
+
+
+@dataclass
+class AudioMeta:
+    """Container facts read from the first bytes of an audio file"""
+    format: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    sample_width: Optional[int] = None
+    duration: Optional[float] = None
+
+
+@functools.lru_cache(maxsize=256)
+def _is_accepted_audio_type(file_extension: Optional[str], content_type: Optional[str]) -> bool:
+    """Extension/content-type check, cached since uploads repeat the same few combinations"""
+    # More flexible content type checking
+    valid_content_types = {
+        'audio/wav', 'audio/mpeg', 'audio/mp3', 'audio/flac', 'audio/ogg', 
+        'audio/webm', 'audio/mp4', 'audio/x-wav', 'audio/x-flac', 'audio/x-ms-wma',
+        'application/octet-stream',  # Common fallback for binary files
+        None  # Allow files without content type
+    }
+    
+    if content_type and content_type not in valid_content_types:
+        # Log but don't reject - try to validate by extension instead
+        logger.info(f"Unknown content type '{content_type}', checking file extension...")
+    
+    # Check file extension (primary validation)
+    if file_extension:
+        if file_extension in SUPPORTED_FORMATS:
+            logger.info(f"Valid audio file extension: {file_extension}")
+            return True
+        logger.warning(f"Unsupported format: {file_extension}")
+    
+    # For browser recordings without proper filename/extension, be more lenient
+    # If content type suggests audio, allow it
+    if content_type and content_type.startswith('audio/'):
+        logger.info(f"Allowing audio based on content type: {content_type}")
+        return True
+    # If it's a generic binary file, allow it and let pydub handle it
+    if content_type == 'application/octet-stream' or not content_type:
+        logger.info("Allowing binary/unknown file type - will validate with pydub")
+        return True
+    
+    return False
 
 
 def validate_audio_file(file: UploadFile) -> bool:
     """Validate uploaded audio file with flexible content type checking"""
     try:
-        # More flexible content type checking
-        valid_content_types = {
-            'audio/wav', 'audio/mpeg', 'audio/mp3', 'audio/flac', 'audio/ogg', 
-            'audio/webm', 'audio/mp4', 'audio/x-wav', 'audio/x-flac', 'audio/x-ms-wma',
-            'application/octet-stream',  # Common fallback for binary files
-            None  # Allow files without content type
-        }
-        
-        if file.content_type and file.content_type not in valid_content_types:
-            # Log but don't reject - try to validate by extension instead
-            logger.info(f"Unknown content type '{file.content_type}', checking file extension...")
-        
-        # Check file extension (primary validation)
-        has_valid_extension = False
-        if file.filename:
-            file_extension = '.' + file.filename.split('.')[-1].lower()
-            if file_extension in SUPPORTED_FORMATS:
-                has_valid_extension = True
-                logger.info(f"Valid audio file extension: {file_extension}")
-            else:
-                logger.warning(f"Unsupported format: {file_extension}")
-        
-        # For browser recordings without proper filename/extension, be more lenient
-        if not has_valid_extension:
-            # If content type suggests audio, allow it
-            if file.content_type and file.content_type.startswith('audio/'):
-                logger.info(f"Allowing audio based on content type: {file.content_type}")
-                has_valid_extension = True
-            # If it's a generic binary file, allow it and let pydub handle it
-            elif file.content_type == 'application/octet-stream' or not file.content_type:
-                logger.info("Allowing binary/unknown file type - will validate with pydub")
-                has_valid_extension = True
-        
-        if not has_valid_extension:
+        file_extension = '.' + file.filename.split('.')[-1].lower() if file.filename else None
+        if not _is_accepted_audio_type(file_extension, file.content_type):
             logger.warning(f"Rejected file: filename='{file.filename}', content_type='{file.content_type}'")
             return False
         
@@ -215,4 +241,187 @@ def get_audio_info(audio_data: bytes) -> dict:
             'frame_count': 0,
             'max_possible_amplitude': 0,
             'size_bytes': len(audio_data)
-        }
\ No newline at end of file
+        }
+
+
+def build_streaming_wav_header(sample_rate: int, channels: int = 1, sample_width: int = 2) -> bytes:
+    """Build a PCM WAV header for a stream whose total length is not known upfront"""
+    byte_rate = sample_rate * channels * sample_width
+    block_align = channels * sample_width
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', STREAMING_WAV_SIZE, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate, byte_rate, block_align, sample_width * 8,
+        b'data', STREAMING_WAV_SIZE
+    )
+
+
+def sniff_audio_header(header: bytes) -> AudioMeta:
+    """Identify the audio container from its magic bytes; WAV headers are fully parsed"""
+    if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+        return _parse_wav_header(header)
+    if header[:4] == b'OggS':
+        return AudioMeta(format='ogg')
+    if header[:4] == b'fLaC':
+        return AudioMeta(format='flac')
+    if header[:4] == b'\x1aE\xdf\xa3':
+        return AudioMeta(format='webm')
+    if header[4:8] == b'ftyp':
+        return AudioMeta(format='mp4')
+    if header[:3] == b'ID3' or (len(header) > 1 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0):
+        return AudioMeta(format='mp3')
+    return AudioMeta()
+
+
+def _parse_wav_header(header: bytes) -> AudioMeta:
+    """Walk RIFF chunks up to 'data' to read the stream format and duration"""
+    meta = AudioMeta(format='wav')
+    byte_rate = 0
+    offset = 12
+    
+    while offset + 8 <= len(header):
+        chunk_id, chunk_size = struct.unpack_from('<4sI', header, offset)
+        body = offset + 8
+        if chunk_id == b'fmt ' and body + 16 <= len(header):
+            _, channels, sample_rate, byte_rate, _, bits = struct.unpack_from('<HHIIHH', header, body)
+            meta.channels, meta.sample_rate, meta.sample_width = channels, sample_rate, bits // 8
+        elif chunk_id == b'data':
+            if byte_rate and chunk_size != STREAMING_WAV_SIZE:
+                meta.duration = chunk_size / byte_rate
+            break
+        offset = body + chunk_size + (chunk_size & 1)
+    
+    return meta
+
+
+def decode_to_pcm16(audio_data: bytes, sample_rate: int = 16000, audio_format: Optional[str] = None) -> np.ndarray:
+    """Decode any supported audio container to mono int16 samples (picklable for process pools)
+    
+    A 'wav' format hint lets pydub read PCM WAV directly instead of spawning ffmpeg.
+    """
+    audio = AudioSegment.from_file(io.BytesIO(audio_data), format='wav' if audio_format == 'wav' else None)
+    audio = audio.set_channels(1).set_frame_rate(sample_rate).set_sample_width(2)
+    return np.frombuffer(audio.raw_data, dtype=np.int16)
+
+
+def silent_wav(seconds: float = 1.0, sample_rate: int = 16000) -> bytes:
+    """Build a mono 16-bit WAV of digital silence"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b'\x00\x00' * int(seconds * sample_rate))
+    return buffer.getvalue()
+
+
+def split_wav(audio_data: bytes) -> Tuple[Tuple[int, int, int], bytes]:
+    """Split WAV bytes into ((sample_rate, channels, sample_width), raw PCM frames)"""
+    with wave.open(io.BytesIO(audio_data), 'rb') as wav_file:
+        params = (wav_file.getframerate(), wav_file.getnchannels(), wav_file.getsampwidth())
+        frames = wav_file.readframes(wav_file.getnframes())
+    return params, frames
+
+
+def conform_pcm(frames: bytes, params: Tuple[int, int, int], target: Tuple[int, int, int]) -> bytes:
+    """Convert raw PCM frames from one (sample_rate, channels, sample_width) format to another"""
+    if params == target:
+        return frames
+    segment = AudioSegment(data=frames, frame_rate=params[0], channels=params[1], sample_width=params[2])
+    return segment.set_frame_rate(target[0]).set_channels(target[1]).set_sample_width(target[2]).raw_data
+
+
+def encode_opus(audio_data: bytes, bitrate: str = "48k") -> bytes:
+    """Re-encode WAV bytes as Ogg/Opus (needs ffmpeg with libopus)"""
+    output_buffer = io.BytesIO()
+    AudioSegment.from_file(io.BytesIO(audio_data), format="wav").export(
+        output_buffer, format="ogg", codec="libopus", bitrate=bitrate
+    )
+    return output_buffer.getvalue()
+
+
+def concat_audio_segments(segments: List[AudioSegment], pause_ms: int = 0) -> AudioSegment:
+    """Join segments in one pass, optionally with a pause after each one
+    
+    Summing AudioSegments re-copies the whole track for every segment; this
+    conforms each segment to the first one's format and joins the raw PCM once.
+    """
+    first = segments[0]
+    frame_rate, channels, sample_width = first.frame_rate, first.channels, first.sample_width
+    pause = b""
+    if pause_ms:
+        pause = (AudioSegment.silent(duration=pause_ms, frame_rate=frame_rate)
+                 .set_channels(channels).set_sample_width(sample_width).raw_data)
+    
+    chunks = []
+    for segment in segments:
+        segment = segment.set_frame_rate(frame_rate).set_channels(channels).set_sample_width(sample_width)
+        chunks.append(segment.raw_data)
+        if pause:
+            chunks.append(pause)
+    
+    return first._spawn(b''.join(chunks))
+
+
+async def iter_upload(file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield an uploaded file in fixed-size chunks, enforcing MAX_AUDIO_SIZE as it streams"""
+    total_size = 0
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        total_size += len(chunk)
+        if total_size > MAX_AUDIO_SIZE:
+            raise ValueError(f"Audio upload exceeds {MAX_AUDIO_SIZE} bytes")
+        yield chunk
+
+
+async def read_upload(file: UploadFile) -> bytearray:
+    """Read a whole upload into one buffer
+
+    When the upload size is known the buffer is allocated once and the
+    spooled file is read straight into it, instead of building a fresh
+    bytes object per read and copying it again.
+    """
+    size = getattr(file, "size", None)
+    if not size:
+        buffer = bytearray()
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            buffer += chunk
+        return buffer
+    
+    buffer = bytearray(size)
+    filled = 0
+    with memoryview(buffer) as view:
+        while filled < size:
+            count = await asyncio.to_thread(file.file.readinto, view[filled:])
+            if not count:
+                break
+            filled += count
+    
+    if filled < size:
+        del buffer[filled:]
+    else:
+        # Reported size was short; pick up anything left
+        buffer += await file.read()
+    return buffer
+
+
+async def iter_audio_chunks(audio_data: bytes, chunk_size: int = RESPONSE_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield in-memory audio in fixed-size chunks for StreamingResponse"""
+    for offset in range(0, len(audio_data), chunk_size):
+        yield audio_data[offset:offset + chunk_size]
+
+
+async def iter_multipart_audio(
+    metadata: bytes,
+    audio_data: bytes,
+    boundary: str,
+    media_type: str = "audio/wav"
+) -> AsyncIterator[bytes]:
+    """Yield a multipart/mixed body: a JSON metadata part followed by the audio part"""
+    yield f"--{boundary}\r\nContent-Type: application/json\r\n\r\n".encode() + metadata
+    yield f"\r\n--{boundary}\r\nContent-Type: {media_type}\r\n\r\n".encode()
+    async for chunk in iter_audio_chunks(audio_data):
+        yield chunk
+    yield f"\r\n--{boundary}--\r\n".encode()
@@ -4,26 +4,29 @@ Optimized for RTX 5090 GPU acceleration
 """
 
 import asyncio
+import base64
+import importlib.util
 import io
 import logging
+import time
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
 import uvicorn
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import StreamingResponse, ORJSONResponse
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app.config import Settings
+from app.middleware import AudioAwareGZipMiddleware
 from app.websocket_manager import WebSocketManager
 from services.stt_service import STTService
 from services.llm_service import LLMService
-from utils.audio_utils import validate_audio_file, convert_audio_format, detect_voice_activity, get_audio_info
+from utils.audio_utils import validate_audio_file, convert_audio_format, detect_voice_activity, get_audio_info, read_upload
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -49,11 +52,11 @@ async def lifespan(app: FastAPI):
     # Initialize services
     try:
         stt_service = STTService()
-        await stt_service.initialize()
-        logger.info("✅ STT Service initialized with GPU support")
-        
         llm_service = LLMService()
-        await llm_service.initialize()
+        
+        # Whisper loading and the LM Studio connection don't depend on each other
+        await asyncio.gather(stt_service.initialize(), llm_service.initialize())
+        logger.info("✅ STT Service initialized with GPU support")
         logger.info("✅ LLM Service initialized with LM Studio")
         
         logger.info("🎙️ Ultimate Voice Bridge is ready for voice processing!")
@@ -82,6 +85,7 @@ app = FastAPI(
     version="1.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -94,7 +98,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(AudioAwareGZipMiddleware, minimum_size=1000)
 
 
 @app.get("/")
@@ -128,16 +132,19 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Enhanced health check endpoint"""
+    timestamp = time.monotonic()
     try:
-        gpu_info = await get_gpu_info()
-        stt_healthy = await stt_service.health_check() if stt_service else False
-        
-        # Get STT performance stats
-        stt_stats = await stt_service.get_performance_stats() if stt_service else {}
+        # GPU info, STT health and STT performance stats are independent probes
+        if stt_service:
+            gpu_info, stt_healthy, stt_stats = await asyncio.gather(
+                get_gpu_info(), stt_service.health_check(), stt_service.get_performance_stats()
+            )
+        else:
+            gpu_info, stt_healthy, stt_stats = await get_gpu_info(), False, {}
         
         return {
             "status": "healthy" if stt_healthy else "degraded",
-            "timestamp": asyncio.get_event_loop().time(),
+            "timestamp": timestamp,
             "services": {
                 "stt": "healthy" if stt_healthy else "unhealthy",
                 "gpu": "available" if gpu_info["cuda_available"] else "unavailable"
@@ -151,7 +158,7 @@ async def health_check():
         logger.error(f"Health check failed: {e}")
         return {
             "status": "unhealthy",
-            "timestamp": asyncio.get_event_loop().time(),
+            "timestamp": timestamp,
             "error": str(e),
             "version": "1.1.0"
         }
@@ -179,7 +186,7 @@ async def speech_to_text(
             )
         
         # Read audio data
-        audio_data = await audio.read()
+        audio_data = await read_upload(audio)
         logger.info(f"📄 Processing audio file: {audio.filename} ({len(audio_data)} bytes)")
         
         # Get audio information
@@ -261,7 +268,7 @@ async def voice_to_llm_pipeline(
             )
         
         # Read and process audio
-        audio_data = await audio.read()
+        audio_data = await read_upload(audio)
         logger.info(f"🎙️ Starting Voice-to-LLM pipeline: {audio.filename} ({len(audio_data)} bytes)")
         
         # Get audio information and check voice activity
@@ -402,7 +409,7 @@ async def analyze_audio(audio: UploadFile = File(..., description="Audio file to
         if not validate_audio_file(audio):
             raise HTTPException(status_code=400, detail="Invalid audio file")
         
-        audio_data = await audio.read()
+        audio_data = await read_upload(audio)
         
         # Get comprehensive audio analysis
         audio_info = get_audio_info(audio_data)
@@ -432,18 +439,23 @@ async def websocket_endpoint(websocket: WebSocket):
         logger.info(f"🔌 WebSocket client connected: {websocket.client}")
         
         while True:
-            # Receive message from client
-            data = await websocket.receive_json()
+            # Receive message from client; audio arrives as binary frames, control messages as JSON
+            try:
+                data = await websocket_manager.receive_frame(websocket)
+            except ValueError as e:
+                await websocket_manager.send_json(websocket, {"type": "error", "message": f"Invalid message: {e}"})
+                continue
+            if isinstance(data, bytes):
+                audio_data, data = data, {"type": "audio_chunk"}
+            else:
+                audio_data = data.get("audio_data")
             
             # Handle different message types
             if data.get("type") == "audio_chunk":
                 # Process real-time audio chunk for streaming STT
-                audio_data = data.get("audio_data")
-                
                 if audio_data and stt_service:
                     try:
-                        # Convert base64 to bytes if needed
-                        import base64
+                        # Legacy JSON clients still send base64 text
                         if isinstance(audio_data, str):
                             audio_bytes = base64.b64decode(audio_data)
                         else:
@@ -453,7 +465,7 @@ async def websocket_endpoint(websocket: WebSocket):
                         result = await stt_service.stream_transcribe(audio_bytes)
                         
                         if result:
-                            await websocket.send_json({
+                            await websocket_manager.send_json(websocket, {
                                 "type": "transcription",
                                 "text": result["text"],
                                 "confidence": result.get("confidence", 0),
@@ -462,14 +474,14 @@ async def websocket_endpoint(websocket: WebSocket):
                             })
                     except Exception as e:
                         logger.error(f"Stream transcription error: {e}")
-                        await websocket.send_json({
+                        await websocket_manager.send_json(websocket, {
                             "type": "error",
                             "message": f"Stream transcription failed: {str(e)}"
                         })
             
             elif data.get("type") == "ping":
                 # Heartbeat
-                await websocket.send_json({"type": "pong"})
+                await websocket_manager.send_pong(websocket)
                 
         
     except WebSocketDisconnect:
@@ -477,7 +489,7 @@ async def websocket_endpoint(websocket: WebSocket):
         websocket_manager.disconnect(websocket)
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
-        await websocket.send_json({
+        await websocket_manager.send_json(websocket, {
             "type": "error",
             "message": str(e)
         })
@@ -519,5 +531,8 @@ if __name__ == "__main__":
         host=settings.backend_host,
         port=8001,  # Different port to avoid conflicts
         reload=False,
-        log_level=settings.log_level.lower()
+        log_level=settings.log_level.lower(),
+        # C event loop and HTTP parser when installed (uvloop has no Windows build)
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11"
     )
\ No newline at end of file
@@ -220,13 +220,13 @@ export default function VoiceRecorder() {
           isPrimary: index === primaryFileIndex
         })
         
-        formData.append(`file_${index}`, file)
-        formData.append(`file_${index}_name`, file.name)
-        formData.append(`file_${index}_type`, file.type)
-        formData.append(`file_${index}_size`, file.size.toString())
-        formData.append(`file_${index}_last_modified`, file.lastModified.toString())
-        formData.append(`file_${index}_is_primary`, (index === primaryFileIndex).toString())
+        formData.append('files', file)
       })
+      formData.append('file_metadata_json', JSON.stringify(uploadedFiles.map((file, index) => ({
+        name: file.name,
+        type: file.type,
+        is_primary: index === primaryFileIndex
+      }))))
       
       // Add total file count
       formData.append('total_files', uploadedFiles.length.toString())
@@ -1363,7 +1363,18 @@ export default function VoiceRecorder() {
       const transcriptConfidence = enhancedData?.transcript?.confidence || parseFloat(response.headers.get('X-Transcript-Confidence') || '0')
       const transcriptDevice = enhancedData?.transcript?.device_used || 'unknown'
       const llmResponse = enhancedData?.llm_response?.text || response.headers.get('X-LLM-Response') || 'No response'
-      const llmReasoning = enhancedData?.llm_response?.reasoning || '' // FULL reasoning now!
+      let llmReasoning = enhancedData?.llm_response?.reasoning || ''
+      if (enhancedData?.llm_response?.reasoning_truncated) {
+        // Headers only carry a preview of long reasoning; fetch the full text
+        try {
+          const reasoningResponse = await fetch(`http://localhost:8001/api/v1/last-reasoning/${enhancedData.llm_response.reasoning_id}`)
+          if (reasoningResponse.ok) {
+            llmReasoning = (await reasoningResponse.json()).reasoning || llmReasoning
+          }
+        } catch (error) {
+          console.error('Error fetching full reasoning:', error)
+        }
+      }
       const llmModel = enhancedData?.llm_response?.model || selectedModel
       const llmTokens = enhancedData?.llm_response?.tokens || parseInt(response.headers.get('X-LLM-Tokens') || '0')
       const sttTime = enhancedData?.transcript?.processing_time || parseFloat(response.headers.get('X-STT-Time') || '0')